@@ -99,8 +99,11 @@ def main():
         platform_overrides = upload_args.pop('platform_overrides')
         upload_args.update(platform_overrides)
 
-    upload_results = upload_pipeline.run(video_path=conversion_output,
-                                         **upload_args)
+    try:
+        upload_results = upload_pipeline.run(video_path=conversion_output,
+                                             **upload_args)
+    finally:
+        upload_pipeline.close()
 
     # Summary of results
     print("\n" + "=" * 60)
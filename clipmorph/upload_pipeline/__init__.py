@@ -1,8 +1,11 @@
 from concurrent.futures import as_completed
+from concurrent.futures import Future
 from concurrent.futures import ThreadPoolExecutor
 import logging
+import threading
 from typing import Dict
 
+from .limiter import AdaptiveLimiter
 from .platforms import InstagramUploadPipeline
 from .platforms import TikTokUploadPipeline
 from .platforms import TwitterUploadPipeline
@@ -40,7 +43,8 @@ class UploadPipeline:
                  instagram: bool = False,
                  tiktok: bool = False,
                  twitter: bool = False,
-                 max_workers: int = 4):
+                 max_workers: int = 4,
+                 max_uploads_per_platform: int = 2):
         """
         Initialize the upload pipeline with platform configurations.
         
@@ -50,36 +54,99 @@ class UploadPipeline:
             tiktok: Whether to upload to TikTok
             twitter: Whether to upload to Twitter
             max_workers: Maximum number of parallel uploads
+            max_uploads_per_platform: Most uploads allowed in flight to one
+                platform; each platform starts at one and grows toward this
+                while its requests succeed
         """
         self.max_workers = max_workers
+        self.max_uploads_per_platform = max_uploads_per_platform
         self.enabled_platforms = {}
 
+        # Per-platform adaptive limits on in-flight uploads, shrunk on 429/5xx
+        self._platform_limiters = {}
+
+        # Pipeline instances keep per-upload state (progress bar, API
+        # clients), so each in-flight upload checks out its own instance
+        self._pipeline_lock = threading.Lock()
+        self._platform_pipelines = {}
+        self._idle_pipelines = {}
+
         # Initialize enabled platforms
         if youtube:
             try:
-                self.enabled_platforms['YouTube'] = YouTubeUploadPipeline()
+                self._register_platform('YouTube', YouTubeUploadPipeline())
             except Exception as e:
                 logging.warning(f"Failed to initialize YouTube pipeline: {e}")
 
         if instagram:
             try:
-                self.enabled_platforms['Instagram'] = InstagramUploadPipeline()
+                self._register_platform('Instagram',
+                                        InstagramUploadPipeline())
             except Exception as e:
                 logging.warning(
                     f"Failed to initialize Instagram pipeline: {e}")
 
         if tiktok:
             try:
-                self.enabled_platforms['TikTok'] = TikTokUploadPipeline()
+                self._register_platform('TikTok', TikTokUploadPipeline())
             except Exception as e:
                 logging.warning(f"Failed to initialize TikTok pipeline: {e}")
 
         if twitter:
             try:
-                self.enabled_platforms['Twitter'] = TwitterUploadPipeline()
+                self._register_platform('Twitter', TwitterUploadPipeline())
             except Exception as e:
                 logging.warning(f"Failed to initialize Twitter pipeline: {e}")
 
+        # Long-lived executor so uploads of consecutive videos can overlap
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="clipmorph-upload")
+
+    def _register_platform(self, platform_name: str, pipeline):
+        """
+        Enable a platform, using pipeline as its first pipeline instance.
+        
+        Args:
+            platform_name: Name of the platform
+            pipeline: Platform upload pipeline instance
+        """
+        limiter = AdaptiveLimiter(initial=1,
+                                  max_limit=self.max_uploads_per_platform)
+        pipeline.limiter = limiter
+        self.enabled_platforms[platform_name] = pipeline
+        self._platform_limiters[platform_name] = limiter
+        self._platform_pipelines[platform_name] = [pipeline]
+        self._idle_pipelines[platform_name] = [pipeline]
+
+    def _checkout_pipeline(self, platform_name: str):
+        """
+        Take an idle pipeline instance for a platform, creating another one
+        when all are busy. The platform's limiter bounds how many exist.
+        
+        Args:
+            platform_name: Name of the platform
+            
+        Returns:
+            Platform upload pipeline instance for the caller's exclusive use
+        """
+        with self._pipeline_lock:
+            idle = self._idle_pipelines[platform_name]
+            if idle:
+                return idle.pop()
+            template = self.enabled_platforms[platform_name]
+
+        pipeline = type(template)()
+        pipeline.limiter = self._platform_limiters[platform_name]
+        with self._pipeline_lock:
+            self._platform_pipelines[platform_name].append(pipeline)
+        return pipeline
+
+    def _return_pipeline(self, platform_name: str, pipeline):
+        """Give back a pipeline instance taken with _checkout_pipeline."""
+        with self._pipeline_lock:
+            self._idle_pipelines[platform_name].append(pipeline)
+
     def _smart_truncate_content(self, title: str, description: str, tags: list,
                                 max_chars: int) -> str:
         """
@@ -105,35 +172,37 @@ class UploadPipeline:
         if len(title) >= max_chars:
             return title[:max_chars].strip()
 
+        # Lengths are measured on the joined, stripped text, since an empty
+        # or padded title changes how much of the separators survives
+        sep = "\n\n"
+        sep_len = len(sep)
+        tags_part = (hashtags,) if hashtags else ()
+
         # Try title + hashtags
-        title_tags = f"{title}\n\n{hashtags}".strip() if hashtags else title
+        title_tags = (sep.join((title, hashtags)).strip()
+                      if hashtags else title)
         if len(title_tags) <= max_chars:
             # If we have room, try to add description
             if description:
-                full_content = f"{title}\n\n{description}\n\n{hashtags}".strip(
-                ) if hashtags else f"{title}\n\n{description}".strip()
+                full_content = sep.join((title, description) +
+                                        tags_part).strip()
                 if len(full_content) <= max_chars:
                     return full_content
-                else:
-                    # Truncate description to fit
-                    available_for_desc = max_chars - len(
-                        title_tags) - 4  # 4 for "\n\n" separators
-                    if available_for_desc > 10:  # Only add description if we have meaningful space
-                        truncated_desc = description[:
-                                                     available_for_desc].strip(
-                                                     )
-                        return f"{title}\n\n{truncated_desc}\n\n{hashtags}".strip(
-                        ) if hashtags else f"{title}\n\n{truncated_desc}".strip(
-                        )
+
+                # Truncate description to fit between two separators
+                available_for_desc = max_chars - len(title_tags) - 2 * sep_len
+                if available_for_desc > 10:  # Only add meaningful descriptions
+                    truncated_desc = description[:available_for_desc].strip()
+                    return sep.join((title, truncated_desc) +
+                                    tags_part).strip()
             return title_tags
-        else:
-            # Truncate hashtags to fit with title
-            available_for_tags = max_chars - len(title) - 4  # 4 for "\n\n"
-            if available_for_tags > 5:  # Need space for at least one hashtag
-                truncated_hashtags = hashtags[:available_for_tags].strip()
-                return f"{title}\n\n{truncated_hashtags}".strip()
-            else:
-                return title
+
+        # Truncate hashtags to fit with title, keeping the same reserve
+        available_for_tags = max_chars - len(title) - 2 * sep_len
+        if available_for_tags > 5:  # Need space for at least one hashtag
+            truncated_hashtags = hashtags[:available_for_tags].strip()
+            return sep.join((title, truncated_hashtags)).strip()
+        return title
 
     def _map_common_parameters(self, platform_name: str, title: str,
                                **kwargs) -> Dict:
@@ -195,14 +264,13 @@ class UploadPipeline:
         else:
             return {}
 
-    def _upload_single_platform(self, platform_name: str, pipeline,
-                                video_path: str, title: str, **kwargs) -> Dict:
+    def _upload_single_platform(self, platform_name: str, video_path: str,
+                                title: str, **kwargs) -> Dict:
         """
         Upload to a single platform and return results.
         
         Args:
             platform_name: Name of the platform
-            pipeline: Platform upload pipeline instance
             video_path: Path to video file
             **kwargs: Common upload parameters
             
@@ -229,8 +297,15 @@ class UploadPipeline:
                     param_name = key[len(platform_specific_key):]
                     platform_params[param_name] = value
 
-            # Call the platform's run method
-            result = pipeline.run(video_path=video_path, **platform_params)
+            # Call the platform's run method once a slot is available, on a
+            # pipeline instance no other upload is using
+            with self._platform_limiters[platform_name]:
+                pipeline = self._checkout_pipeline(platform_name)
+                try:
+                    result = pipeline.run(video_path=video_path,
+                                          **platform_params)
+                finally:
+                    self._return_pipeline(platform_name, pipeline)
 
             return {
                 'platform': platform_name,
@@ -247,6 +322,29 @@ class UploadPipeline:
                 'error': str(e)
             }
 
+    def submit(self, video_path: str, title: str,
+               **platform_kwargs) -> Dict[str, Future]:
+        """
+        Start uploading a video to all enabled platforms without waiting.
+        
+        Futures resolve to the same result dictionaries returned by run(), so
+        callers can start the next video's uploads before this one finishes.
+        
+        Args:
+            video_path: Path to the video file to upload
+            **platform_kwargs: Platform-specific parameters
+            
+        Returns:
+            Dictionary mapping platform names to futures of their upload results
+        """
+        return {
+            platform_name:
+            self._executor.submit(self._upload_single_platform,
+                                  platform_name, video_path, title,
+                                  **platform_kwargs)
+            for platform_name in self.enabled_platforms
+        }
+
     def run(self, video_path: str, title: str,
             **platform_kwargs) -> Dict[str, Dict]:
         """
@@ -266,36 +364,46 @@ class UploadPipeline:
 
         results = {}
 
-        # Use ThreadPoolExecutor for parallel uploads
-        with ThreadPoolExecutor(max_workers=min(
-                self.max_workers, len(self.enabled_platforms))) as executor:
-            # Submit all upload tasks
-            future_to_platform = {
-                executor.submit(self._upload_single_platform, platform_name, pipeline, video_path, title, **platform_kwargs):
-                platform_name
-                for platform_name, pipeline in self.enabled_platforms.items()
-            }
+        # Submit all upload tasks
+        future_to_platform = {
+            future: platform_name
+            for platform_name, future in self.submit(
+                video_path, title, **platform_kwargs).items()
+        }
 
-            # Collect results as they complete
-            for future in as_completed(future_to_platform):
-                platform_name = future_to_platform[future]
-                try:
-                    result = future.result()
-                    results[platform_name] = result
-
-                    if not result['success']:
-                        logging.error(
-                            f"{platform_name} upload failed: {result['error']}"
-                        )
-
-                except Exception as e:
-                    results[platform_name] = {
-                        'platform': platform_name,
-                        'success': False,
-                        'result': None,
-                        'error': f"Future execution failed: {str(e)}"
-                    }
+        # Collect results as they complete
+        for future in as_completed(future_to_platform):
+            platform_name = future_to_platform[future]
+            try:
+                result = future.result()
+                results[platform_name] = result
+
+                if not result['success']:
                     logging.error(
-                        f"{platform_name} upload failed with exception: {e}")
+                        f"{platform_name} upload failed: {result['error']}")
+
+            except Exception as e:
+                results[platform_name] = {
+                    'platform': platform_name,
+                    'success': False,
+                    'result': None,
+                    'error': f"Future execution failed: {str(e)}"
+                }
+                logging.error(
+                    f"{platform_name} upload failed with exception: {e}")
 
         return results
+
+    def close(self):
+        """Wait for pending uploads and shut down the worker threads."""
+        self._executor.shutdown(wait=True)
+        for pipelines in self._platform_pipelines.values():
+            for pipeline in pipelines:
+                pipeline.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+        return False
@@ -0,0 +1,79 @@
+import threading
+
+
+class AdaptiveLimiter:
+    """
+    Additive-increase/multiplicative-decrease limiter for in-flight uploads.
+
+    Each retriable failure (429/5xx or network error) halves the number of
+    uploads allowed in flight for a platform, while a run of consecutive
+    successes raises it again one slot at a time.
+    """
+
+    def __init__(self,
+                 initial: int = 2,
+                 min_limit: int = 1,
+                 max_limit: int = None,
+                 success_threshold: int = 5,
+                 ewma_alpha: float = 0.2):
+        """
+        Initialize the limiter.
+
+        Args:
+            initial: Initial number of uploads allowed in flight
+            min_limit: Lower bound the limit can shrink to
+            max_limit: Upper bound the limit can grow to (defaults to initial)
+            success_threshold: Consecutive successes needed to grow the limit
+            ewma_alpha: Smoothing factor for the error rate average
+        """
+        self.limit = initial
+        self.min_limit = min_limit
+        self.max_limit = max_limit if max_limit is not None else initial
+        self.success_threshold = success_threshold
+        self.ewma_alpha = ewma_alpha
+        self.ewma_error_rate = 0.0
+
+        self._in_flight = 0
+        self._consecutive_successes = 0
+        self._condition = threading.Condition()
+
+    def acquire(self):
+        """Block until an upload slot is available and take it."""
+        with self._condition:
+            while self._in_flight >= self.limit:
+                self._condition.wait()
+            self._in_flight += 1
+
+    def release(self):
+        """Give back an upload slot taken with acquire()."""
+        with self._condition:
+            self._in_flight -= 1
+            self._condition.notify()
+
+    def on_success(self):
+        """Record a successful request and grow the limit after a streak."""
+        with self._condition:
+            self.ewma_error_rate *= 1 - self.ewma_alpha
+            self._consecutive_successes += 1
+            if (self._consecutive_successes >= self.success_threshold
+                    and self.limit < self.max_limit):
+                self.limit += 1
+                self._consecutive_successes = 0
+                self._condition.notify()
+
+    def on_failure(self):
+        """Record a retriable failure and halve the limit."""
+        with self._condition:
+            self.ewma_error_rate = (self.ewma_alpha +
+                                    (1 - self.ewma_alpha) *
+                                    self.ewma_error_rate)
+            self._consecutive_successes = 0
+            self.limit = max(self.min_limit, self.limit // 2)
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.release()
+        return False
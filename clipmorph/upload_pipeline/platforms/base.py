@@ -1,8 +1,12 @@
 from abc import ABC
 from abc import abstractmethod
 from contextlib import contextmanager
+import json
 import logging
+import os
 import random
+import sys
+import threading
 import time
 from typing import Any, Callable
 
@@ -10,6 +14,69 @@ import requests
 from tqdm import tqdm
 
 
+class _LogProgress:
+    """
+    Stand-in for a tqdm bar when stderr is not a terminal (CI, log files).
+    It tracks progress like tqdm but sends messages to logging instead of
+    redrawing a bar.
+    """
+
+    def __init__(self, total, desc=""):
+        self.total = total
+        self.n = 0
+        self.desc = desc
+
+    def update(self, n=1):
+        self.n += n
+
+    def set_description(self, desc=None, refresh=True):
+        self.desc = desc or ""
+        logging.debug(desc)
+
+    def refresh(self):
+        pass
+
+    def write(self, s):
+        logging.info(s)
+
+    def close(self):
+        percentage = 100 * self.n / self.total if self.total else 0
+        logging.info(f"{self.desc} ({percentage:.0f}%)")
+
+
+def inspect_requests_response(response):
+    """
+    Inspect a requests.Response for _retry_request.
+    
+    Returns:
+        Tuple of (status, raise_error): status is None for successful
+        responses, otherwise the HTTP status code and a callable that raises
+        the matching error.
+    """
+    if response.ok:
+        return None, None
+    return response.status_code, response.raise_for_status
+
+
+class _SharedTokenAttribute:
+    """
+    Descriptor for an attribute kept in the token state shared by every
+    pipeline instance with the same credentials (see
+    BaseUploadPipeline._share_token_state).
+    """
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        return obj._token_state[self.name]
+
+    def __set__(self, obj, value):
+        obj._token_state[self.name] = value
+
+
 class BaseUploadPipeline(ABC):
     """
     Abstract base class for upload pipelines providing common functionality
@@ -18,7 +85,15 @@ class BaseUploadPipeline(ABC):
 
     # Default retry configuration (can be overridden by subclasses)
     MAX_RETRIES = 3
-    RETRIABLE_STATUS_CODES = [500, 502, 503, 504]
+    RETRIABLE_STATUS_CODES = [429, 500, 502, 503, 504]
+    MAX_RETRY_AFTER = 120  # seconds; longer Retry-After waits fail immediately
+    BACKOFF_BASE = 0.5  # seconds; backoff window for the first retry
+    BACKOFF_CAP = 30  # seconds; largest backoff window
+    MAX_ERROR_BODY_BYTES = 64 * 1024  # larger error bodies aren't parsed for details
+
+    # Token state shared between instances, keyed by (class, credentials key)
+    _token_states = {}
+    _token_states_lock = threading.Lock()
 
     def __init__(self, **kwargs):
         """Initialize base pipeline with common attributes."""
@@ -27,11 +102,46 @@ class BaseUploadPipeline(ABC):
             self.progress_allocations = {}
         if not hasattr(self, 'progress_bar'):
             self.progress_bar = None
+        if not hasattr(self, 'progress_callback'):
+            self.progress_callback = None
+        # Allocations are fixed per pipeline, so total them once
+        self._total_progress = sum(self.progress_allocations.values())
+        self._progress_lock = threading.Lock()
 
         # Platform name (must be set by subclasses)
         if not hasattr(self, 'platform_name'):
             self.platform_name = "Unknown"
 
+        # Response inspector used by _retry_request (set by subclasses)
+        if not hasattr(self, '_response_inspector'):
+            self._response_inspector = inspect_requests_response
+
+        # Optional adaptive concurrency limiter (set by UploadPipeline)
+        if not hasattr(self, 'limiter'):
+            self.limiter = None
+
+    def _share_token_state(self, key, **initial):
+        """
+        Attach this instance to the token state shared by every instance of
+        its class with the same credentials key. Attributes declared with
+        _SharedTokenAttribute then live in that state, so concurrent uploads
+        on separate instances refresh a token under one lock and all see the
+        result.
+
+        Args:
+            key: Identifies the credentials, e.g. the token cache key
+            **initial: Starting values; each only fills in an entry that is
+                missing or None, so a refreshed token isn't overwritten by
+                the one a new instance was constructed with
+        """
+        with BaseUploadPipeline._token_states_lock:
+            state = BaseUploadPipeline._token_states.setdefault(
+                (type(self), key), {})
+            for name, value in initial.items():
+                if state.get(name) is None:
+                    state[name] = value
+        self._token_state = state
+
     def _retry_request(self,
                        func: Callable,
                        *args,
@@ -41,7 +151,9 @@ class BaseUploadPipeline(ABC):
         Retry HTTP requests with exponential backoff and enhanced error messages.
         
         This method provides a generic retry mechanism that works with different
-        types of API responses and exceptions across platforms.
+        types of API responses and exceptions across platforms. Responses are
+        checked with the pipeline's response inspector, so no per-call type
+        probing is needed.
         
         Args:
             func: The function to retry
@@ -63,46 +175,38 @@ class BaseUploadPipeline(ABC):
         for attempt in range(max_retries):
             try:
                 response = func(*args, **kwargs)
+                status, raise_error = self._response_inspector(response)
+
+                # If there is no error status, the request was successful
+                if status is None:
+                    self._record_request_outcome(True)
+                    return response
+
+                if status not in self.RETRIABLE_STATUS_CODES:
+                    # Non-retriable HTTP error, fail immediately
+                    raise_error()
 
-                # Handle HTTP response objects (requests library)
-                if hasattr(response, 'status_code') and hasattr(
-                        response, 'ok') and not response.ok:
-                    if response.status_code in self.RETRIABLE_STATUS_CODES:
-                        # Add helpful context to the error message
-                        self._enhance_error_message(response)
-
-                        if attempt == max_retries - 1:
-                            response.raise_for_status()
-
-                        # Use exponential backoff with jitter for retriable errors
-                        wait_time = (2**attempt) + random.uniform(0, 1)
-                        logging.warning(
-                            f"Retriable HTTP error {response.status_code} (attempt {attempt + 1}/{max_retries}), "
-                            f"retrying in {wait_time:.1f}s: {getattr(response, 'reason', 'Unknown error')}"
-                        )
-                        time.sleep(wait_time)
-                        continue
-                    else:
-                        # Non-retriable HTTP error, fail immediately
-                        response.raise_for_status()
-
-                # Handle Google API HttpError (YouTube)
-                elif hasattr(response, 'resp') and hasattr(
-                        response.resp, 'status'):
-                    if response.resp.status in self.RETRIABLE_STATUS_CODES:
-                        if attempt == max_retries - 1:
-                            raise response
-                        wait_time = (2**attempt) + random.uniform(0, 1)
-                        logging.warning(
-                            f"Retriable HTTP error {response.resp.status} (attempt {attempt + 1}/{max_retries}), "
-                            f"retrying in {wait_time:.1f}s: {response}")
-                        time.sleep(wait_time)
-                        continue
-                    else:
-                        raise response
-
-                # If we get here, the request was successful
-                return response
+                self._record_request_outcome(False)
+
+                # Add helpful context to the error message
+                self._enhance_error_message(response)
+
+                # Honor Retry-After, but don't block on very long waits
+                retry_after = self._retry_after_seconds(response)
+                if (attempt == max_retries - 1 or retry_after is not None
+                        and retry_after > self.MAX_RETRY_AFTER):
+                    raise_error()
+
+                # Use exponential backoff with jitter for retriable errors
+                wait_time = self._backoff(attempt)
+                if retry_after is not None:
+                    wait_time = max(wait_time, retry_after)
+                logging.warning(
+                    "Retriable HTTP error %s (attempt %d/%d), retrying in %.1fs: %s",
+                    status, attempt + 1, max_retries, wait_time,
+                    getattr(response, 'reason', 'Unknown error'))
+                time.sleep(wait_time)
+                continue
 
             except requests.exceptions.RequestException as e:
                 # Only retry network-level errors, not HTTP errors like 4xx
@@ -113,13 +217,14 @@ class BaseUploadPipeline(ABC):
                                    requests.exceptions.Timeout,
                                    requests.exceptions.ChunkedEncodingError)):
                     # These are retriable network-level errors
+                    self._record_request_outcome(False)
                     last_exception = e
                     if attempt == max_retries - 1:
                         raise e
-                    wait_time = (2**attempt) + random.uniform(0, 1)
+                    wait_time = self._backoff(attempt)
                     logging.warning(
-                        f"Network error (attempt {attempt + 1}/{max_retries}), "
-                        f"retrying in {wait_time:.1f}s: {e}")
+                        "Network error (attempt %d/%d), retrying in %.1fs: %s",
+                        attempt + 1, max_retries, wait_time, e)
                     time.sleep(wait_time)
                 else:
                     # Other RequestExceptions should not be retried
@@ -134,10 +239,10 @@ class BaseUploadPipeline(ABC):
                 last_exception = e
                 if attempt == max_retries - 1:
                     raise e
-                wait_time = (2**attempt) + random.uniform(0, 1)
+                wait_time = self._backoff(attempt)
                 logging.warning(
-                    f"Unexpected error (attempt {attempt + 1}/{max_retries}), "
-                    f"retrying in {wait_time:.1f}s: {e}")
+                    "Unexpected error (attempt %d/%d), retrying in %.1fs: %s",
+                    attempt + 1, max_retries, wait_time, e)
                 time.sleep(wait_time)
 
         # This shouldn't be reached, but just in case
@@ -146,6 +251,54 @@ class BaseUploadPipeline(ABC):
         else:
             raise RuntimeError("Unexpected error in retry logic")
 
+    def _backoff(self, attempt: int) -> float:
+        """
+        Exponential backoff with full jitter for the given zero-based attempt.
+        The wait is drawn uniformly from the whole window so clients retrying
+        the same endpoint spread out instead of retrying together.
+        
+        Args:
+            attempt: Number of the attempt that just failed
+            
+        Returns:
+            Seconds to wait before the next attempt
+        """
+        return random.uniform(
+            0, min(self.BACKOFF_CAP, self.BACKOFF_BASE * 2**attempt))
+
+    def _retry_after_seconds(self, response):
+        """
+        Read a numeric Retry-After header from an HTTP response.
+        
+        Args:
+            response: HTTP response object (may lack headers)
+            
+        Returns:
+            Seconds to wait, or None if the header is missing or an HTTP date
+        """
+        headers = getattr(response, 'headers', None)
+        value = headers.get('Retry-After') if headers else None
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except (TypeError, ValueError):
+            return None
+
+    def _record_request_outcome(self, success: bool):
+        """
+        Report a request outcome to the adaptive limiter, if one is attached.
+        
+        Args:
+            success: Whether the request succeeded (False for retriable errors)
+        """
+        if self.limiter is None:
+            return
+        if success:
+            self.limiter.on_success()
+        else:
+            self.limiter.on_failure()
+
     def _enhance_error_message(self, response):
         """
         Enhance error messages by extracting API-specific error details.
@@ -155,7 +308,9 @@ class BaseUploadPipeline(ABC):
             response: HTTP response object to enhance
         """
         try:
-            error_data = response.json()
+            error_data = self._error_json(response)
+            if not error_data:
+                return
 
             # Generic error message extraction (works for most APIs)
             api_error = None
@@ -178,6 +333,70 @@ class BaseUploadPipeline(ABC):
             # If we can't parse the error, just continue
             pass
 
+    def _error_json(self, response):
+        """
+        Parse the JSON body of a failed response for error details.
+        
+        Args:
+            response: HTTP response object
+            
+        Returns:
+            The decoded JSON object, or None if the body is empty, not a JSON
+            object, or larger than MAX_ERROR_BODY_BYTES (e.g. an HTML error page)
+        """
+        content = getattr(response, 'content', None)
+        if not content or len(content) > self.MAX_ERROR_BODY_BYTES:
+            return None
+        try:
+            error_data = json.loads(content)
+        except ValueError:
+            return None
+        return error_data if isinstance(error_data, dict) else None
+
+    def _read_json_cache(self, path, label):
+        """
+        Read a JSON cache file written by _write_json_cache_atomic.
+
+        Args:
+            path: Cache file path, or None if caching is disabled
+            label: What the cache holds, for log messages (e.g. "token cache")
+
+        Returns:
+            The decoded cache, or {} if the file is missing or unreadable
+        """
+        if not path or not os.path.exists(path):
+            return {}
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logging.warning(
+                f"Ignoring unreadable {self.platform_name} {label}: {e}")
+            return {}
+
+    def _write_json_cache_atomic(self, path, data, label):
+        """
+        Write a JSON cache file readable only by the current user (mode
+        0600). The file is replaced atomically, so concurrent readers never
+        see a partial write; failures are logged, not raised.
+
+        Args:
+            path: Cache file path
+            data: JSON-serializable cache contents
+            label: What the cache holds, for log messages (e.g. "token cache")
+        """
+        try:
+            os.makedirs(os.path.dirname(path), mode=0o700, exist_ok=True)
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC,
+                         0o600)
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logging.warning(
+                f"Failed to write {self.platform_name} {label}: {e}")
+
     def _update_progress(self, step_name: str, description: str = ""):
         """
         Update the progress bar based on step completion.
@@ -185,14 +404,22 @@ class BaseUploadPipeline(ABC):
         Args:
             step_name: Name of the step (must exist in self.progress_allocations)
             description: Optional description to show in progress bar
+            
+        Safe to call from worker threads running steps concurrently. If a
+        progress_callback is set it is called with the step name and its
+        share of the total progress, even when no progress bar is shown.
         """
-        if self.progress_bar and step_name in self.progress_allocations:
-            increment = self.progress_allocations[step_name]
-            if increment > 0:
-                self.progress_bar.update(increment)
-            if description:
-                self.progress_bar.set_description(
-                    f"[{self.platform_name}] {description}")
+        if self.progress_callback and step_name in self.progress_allocations:
+            self.progress_callback(step_name,
+                                   self.progress_allocations[step_name])
+        with self._progress_lock:
+            if self.progress_bar and step_name in self.progress_allocations:
+                increment = self.progress_allocations[step_name]
+                if increment > 0:
+                    self.progress_bar.update(increment)
+                if description:
+                    self.progress_bar.set_description(
+                        f"[{self.platform_name}] {description}")
 
     @contextmanager
     def _progress_context(self,
@@ -206,16 +433,22 @@ class BaseUploadPipeline(ABC):
             description: Initial description for the progress bar
             
         Yields:
-            tqdm progress bar object
+            tqdm progress bar object, or a log-only stand-in with the same
+            interface when stderr is not a terminal
         """
-        progress_bar = tqdm(
-            total=total_progress,
-            desc=f"[{self.platform_name}] {description}",
-            unit="%",
-            bar_format="{l_bar}{bar}| {percentage:3.0f}% [{elapsed}<{remaining}]",
-            ncols=100,
-            leave=True,
-            position=0)
+        stderr = sys.stderr
+        if stderr is None or not stderr.isatty():
+            progress_bar = _LogProgress(
+                total_progress, f"[{self.platform_name}] {description}")
+        else:
+            progress_bar = tqdm(
+                total=total_progress,
+                desc=f"[{self.platform_name}] {description}",
+                unit="%",
+                bar_format="{l_bar}{bar}| {percentage:3.0f}% [{elapsed}<{remaining}]",
+                ncols=100,
+                leave=True,
+                position=0)
         self.progress_bar = progress_bar
         try:
             yield progress_bar
@@ -234,6 +467,20 @@ class BaseUploadPipeline(ABC):
         """
         pass
 
+    def close(self):
+        """
+        Release resources held by the pipeline (threads, sessions).
+        Subclasses that hold such resources override this.
+        """
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+        return False
+
     def _validate_required_attributes(self):
         """
         Validate that required attributes are set by subclasses.
@@ -248,7 +495,7 @@ class BaseUploadPipeline(ABC):
                 f"{self.__class__.__name__} must set platform_name")
 
         # Validate progress allocations sum to reasonable total
-        total = sum(self.progress_allocations.values())
+        total = self._total_progress
         if not (90 <= total <= 110):  # Allow some flexibility
             logging.warning(
                 f"Progress allocations sum to {total}%, expected around 100%")
@@ -265,8 +512,7 @@ class BaseUploadPipeline(ABC):
 
         if success:
             # Complete to 100% only on success
-            total_progress = sum(self.progress_allocations.values())
-            remaining = total_progress - self.progress_bar.n
+            remaining = self._total_progress - self.progress_bar.n
             if remaining > 0:
                 self.progress_bar.update(remaining)
             
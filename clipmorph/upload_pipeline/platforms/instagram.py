@@ -1,14 +1,34 @@
+from concurrent.futures import FIRST_EXCEPTION
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait
+from contextlib import contextmanager
+from datetime import timedelta
+import functools
+import hashlib
+import http.server
+import json
 import logging
+import mimetypes
 import os
+import queue
+import random
+import threading
 import time
 import urllib.parse
+import uuid
 import webbrowser
 
-from google.cloud import storage
-from google.oauth2 import service_account
+try:
+    import fcntl
+except ImportError:  # Windows: token refreshes are only serialized in-process
+    fcntl = None
+
 import requests
+from requests.adapters import HTTPAdapter
 
+from .base import _SharedTokenAttribute
 from .base import BaseUploadPipeline
+from .base import inspect_requests_response
 
 
 class InstagramUploadPipeline(BaseUploadPipeline):
@@ -28,9 +48,52 @@ class InstagramUploadPipeline(BaseUploadPipeline):
     DEFAULT_PROCESSING_TIME_PER_MB = 20  # seconds
     MIN_PROCESSING_TIME = 30  # seconds
     MAX_PROGRESS_DURING_PROCESSING = 80  # don't complete progress bar during processing
-    API_POLL_INTERVAL = 5  # seconds between status checks
+    API_POLL_INITIAL_DELAY = 1  # seconds before the first status check
+    API_POLL_MAX_DELAY = 15  # cap on seconds between status checks
+    API_POLL_BACKOFF_FACTOR = 1.6  # growth of the delay after each check
+    API_POLL_JITTER = 0.5  # max random seconds added to each delay
     MIN_PROGRESS_INCREMENT = 1.5
 
+    # Cloud storage upload constants
+    GCS_UPLOAD_CHUNK_SIZE = 32 * 1024 * 1024  # must be a multiple of 256 KiB
+    GCS_UPLOAD_TIMEOUT = (10, 600)  # (connect, read) seconds per chunk
+    GCS_SIGNED_URL_EXPIRATION = timedelta(minutes=30)  # Graph fetch window
+
+    # Batch upload constants
+    BATCH_UPLOAD_WORKERS = 4  # shared worker threads for uploads and cleanup
+    MEDIA_CREATE_MIN_INTERVAL = 1 / 3  # seconds between container creations (3/s)
+
+    # Token cache constants
+    TOKEN_REFRESH_MARGIN = 300  # seconds before expiry a token is refreshed inline
+    LONG_LIVED_TOKEN_LIFETIME = 60 * 24 * 3600  # seconds a long-lived token lasts
+    EARLY_TOKEN_REFRESH_FRACTION = 0.8  # refresh once this share of the lifetime has passed
+    TOKEN_REFRESH_RETRY_DELAY = 60  # base seconds before retrying a failed background refresh
+    TOKEN_REFRESH_LOCK_TIMEOUT = 30  # seconds to wait for another token refresh
+    OAUTH_CALLBACK_TIMEOUT = 300  # seconds to wait for the browser redirect
+
+    # HTTP connection pool constants
+    HTTP_POOL_CONNECTIONS = 4  # number of hosts to keep pools for
+    HTTP_POOL_MAXSIZE = 16  # connections kept alive per host
+    HTTP_CONNECT_TIMEOUT = 5  # seconds to establish a Graph API connection
+
+    # Graph API error codes for an expired or invalidated access token
+    GRAPH_TOKEN_ERROR_CODES = (190, 463)
+
+    # One browser OAuth flow at a time per process; they'd share the
+    # redirect listener's port
+    _oauth_flow_lock = threading.Lock()
+
+    # Tokens and their refresh lock and timer, shared by every instance for
+    # the same app and page so concurrent uploads refresh them only once
+    access_token = _SharedTokenAttribute()
+    access_token_expires_at = _SharedTokenAttribute()
+    page_token = _SharedTokenAttribute()
+    _refresh_lock = _SharedTokenAttribute()
+    _refresh_lock_depth = _SharedTokenAttribute()
+    _refresh_lock_file = _SharedTokenAttribute()
+    _refresh_timer = _SharedTokenAttribute()
+    _refresh_failures = _SharedTokenAttribute()
+
     def __init__(self,
                  facebook_app_id=os.getenv("FACEBOOK_APP_ID"),
                  facebook_app_secret=os.getenv("FACEBOOK_APP_SECRET"),
@@ -46,6 +109,9 @@ class InstagramUploadPipeline(BaseUploadPipeline):
                  api_version='v23.0',
                  request_timeout=30,
                  processing_timeout=360,
+                 token_cache_path=os.path.join("~", ".clipmorph",
+                                               "ig_tokens.json"),
+                 progress_callback=None,
                  auth_scopes=[
                      'instagram_basic', 'pages_show_list',
                      'pages_read_engagement', 'pages_manage_posts',
@@ -80,6 +146,13 @@ class InstagramUploadPipeline(BaseUploadPipeline):
                 Defaults to 30 seconds.
             processing_timeout (int, optional): Timeout for video processing in seconds.
                 Defaults to 120 seconds.
+            token_cache_path (str, optional): File used to persist the access token,
+                page token and Instagram user ID between runs. None disables it.
+                Defaults to '~/.clipmorph/ig_tokens.json'.
+            progress_callback (callable, optional): Called as
+                progress_callback(step_name, percent) as each upload step
+                completes, e.g. to report progress from a worker process.
+                Defaults to None.
             auth_scopes (list, optional): List of Facebook authentication scopes.
                 Defaults to basic Instagram and page management scopes.
         """
@@ -87,7 +160,6 @@ class InstagramUploadPipeline(BaseUploadPipeline):
         self.app_id = facebook_app_id
         self.app_secret = facebook_app_secret
         self.page_id = facebook_page_id
-        self.access_token = facebook_access_token
 
         # Google Cloud credentials
         self.gcp_project_id = gcp_project_id
@@ -101,16 +173,58 @@ class InstagramUploadPipeline(BaseUploadPipeline):
         self.redirect_uri = redirect_uri
         self.api_version = api_version
         self.auth_scopes = auth_scopes
+        self.graph_api_url = f"{self.FACEBOOK_GRAPH_BASE_URL}/{api_version}"
+        self._oauth_dialog_url = (
+            f"{self.FACEBOOK_AUTH_BASE_URL}/{api_version}/dialog/oauth?" +
+            urllib.parse.urlencode({
+                "client_id": self.app_id,
+                "redirect_uri": redirect_uri,
+                "scope": ','.join(auth_scopes),
+                "response_type": "code"
+            }))
 
         # Timeout configuration
         self.request_timeout = request_timeout
         self.processing_timeout = processing_timeout
 
+        # Token cache configuration
+        self.token_cache_path = os.path.expanduser(
+            token_cache_path) if token_cache_path else None
+
         # Runtime state
+        self._share_token_state(self._token_cache_key(),
+                                access_token=facebook_access_token,
+                                access_token_expires_at=None,
+                                page_token=None,
+                                _refresh_lock=threading.RLock(),
+                                _refresh_lock_depth=0,
+                                _refresh_lock_file=None,
+                                _refresh_timer=None,
+                                _refresh_failures=0)
+        self._media_create_lock = threading.Lock()
+        self._last_media_create = 0.0
         self.google_creds = None
-        self.page_token = None
+        self._gcs_client_lock = threading.Lock()
+        self.gcs_client = None
+        self.gcs_bucket = None
+        self._blob_generations = {}
         self.ig_user_id = None
 
+        # Shared worker threads for uploads, Graph setup and cleanup
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.BATCH_UPLOAD_WORKERS,
+            thread_name_prefix="clipmorph-instagram")
+
+        # Shared HTTP session so Graph API calls reuse keep-alive connections;
+        # concurrent callers wait for a pooled connection instead of opening
+        # throwaway ones
+        self.session = requests.Session()
+        self.session.mount(
+            "https://",
+            HTTPAdapter(pool_connections=self.HTTP_POOL_CONNECTIONS,
+                        pool_maxsize=self.HTTP_POOL_MAXSIZE,
+                        pool_block=True))
+
         # Progress bar configuration (redistributed for smoother UX)
         self.progress_allocations = {
             "google_auth": 2,  # 2%
@@ -123,6 +237,10 @@ class InstagramUploadPipeline(BaseUploadPipeline):
             "cleanup": 2  # 2%
         }
         self.progress_bar = None
+        self.progress_callback = progress_callback
+
+        # Response inspector for retried calls (requests library)
+        self._response_inspector = inspect_requests_response
 
         # Set platform name for base class
         self.platform_name = "Instagram"
@@ -154,97 +272,405 @@ class InstagramUploadPipeline(BaseUploadPipeline):
     def _enhance_error_message(self, response):
         """Instagram-specific error message enhancement."""
         try:
-            error_data = response.json()
+            error_data = self._error_json(response)
+            if not error_data:
+                return
             api_error = error_data.get('error', {}).get('message', '')
             if api_error:
                 response.reason = f"{response.reason}: {api_error}"
         except:
             pass
 
-    def _authenticate_google(self):
+    def _graph_error_code(self, response):
+        """Returns the Graph API error (sub)code of a failed response, if any."""
+        error = (self._error_json(response) or {}).get('error', {})
+        if error.get('error_subcode') in self.GRAPH_TOKEN_ERROR_CODES:
+            return error['error_subcode']
+        return error.get('code')
+
+    def _graph_request(self,
+                       method,
+                       path,
+                       token=None,
+                       params=None,
+                       data=None,
+                       timeout=None):
         """
-        Authenticates with Google Cloud using the provided scopes.
-        Returns a credentials object.
+        Sends a Graph API request through the shared session with retries.
+
+        If Graph rejects the access token as expired or invalid, the token is
+        renewed once and the request is repeated.
+
+        Args:
+            method: HTTP method ('GET' or 'POST')
+            path: Path below the versioned Graph API URL
+            token: Which access token to send: 'user', 'page' or None
+            params: Query string parameters
+            data: Form fields for POST requests
+            timeout: Request timeout in seconds (defaults to request_timeout)
+
+        Returns:
+            The successful requests.Response
+        """
+        url = f"{self.graph_api_url}/{path}"
+        for renewed in (False, True):
+            query, body = dict(params or {}), dict(data or {})
+            if token:
+                fields = body if method == "POST" else query
+                sent_token = fields['access_token'] = (
+                    self.access_token if token == "user" else self.page_token)
+            try:
+                return self._retry_request(
+                    self.session.request,
+                    method,
+                    url,
+                    params=query,
+                    data=body or None,
+                    timeout=(self.HTTP_CONNECT_TIMEOUT, timeout
+                             or self.request_timeout))
+            except requests.exceptions.HTTPError as e:
+                code = self._graph_error_code(e.response)
+                if (renewed or not token
+                        or code not in self.GRAPH_TOKEN_ERROR_CODES):
+                    raise
+                logging.warning(
+                    "Graph API rejected %s token (code=%s, method=%s, path=%s), "
+                    "renewing and retrying", token, code, method, path)
+                self._renew_graph_token(token, sent_token)
+
+    def _renew_graph_token(self, token, stale_token):
+        """
+        Renews the user or page access token after Graph rejected it, unless
+        another thread already replaced the rejected token.
+
+        Args:
+            token: Which access token to renew: 'user' or 'page'
+            stale_token: The token value Graph rejected
+        """
+        if token == "user":
+            self._refresh_access_token(stale_token)
+            return
+        with self._token_refresh_guard():
+            if self.page_token != stale_token:
+                return
+            self.page_token = self._graph_request(
+                "GET", self.page_id, token="user",
+                params={"fields": "access_token"}).json()['access_token']
+            self._save_cached_tokens()
+
+    @contextmanager
+    def _token_refresh_guard(self):
+        """
+        Serializes token refreshes so concurrent uploads don't invalidate each
+        other's tokens. Reentrant within a thread; across processes sharing
+        the token cache it also holds an exclusive lock on a sibling lock file.
+
+        Raises:
+            TimeoutError: If another refresh holds the lock for longer than
+                TOKEN_REFRESH_LOCK_TIMEOUT seconds
+        """
+        deadline = time.monotonic() + self.TOKEN_REFRESH_LOCK_TIMEOUT
+        if not self._refresh_lock.acquire(
+                timeout=self.TOKEN_REFRESH_LOCK_TIMEOUT):
+            raise TimeoutError(
+                "Timed out waiting for another Instagram token refresh")
+        try:
+            if self._refresh_lock_depth == 0:
+                self._lock_token_cache_file(deadline)
+            self._refresh_lock_depth += 1
+            try:
+                yield
+            finally:
+                self._refresh_lock_depth -= 1
+                if self._refresh_lock_depth == 0 and self._refresh_lock_file:
+                    self._refresh_lock_file.close()
+                    self._refresh_lock_file = None
+        finally:
+            self._refresh_lock.release()
+
+    def _lock_token_cache_file(self, deadline):
+        """
+        Takes an exclusive flock on the token cache's lock file, polling until
+        the deadline. Does nothing without a token cache or fcntl.
+        """
+        if not self.token_cache_path or fcntl is None:
+            return
+        os.makedirs(os.path.dirname(self.token_cache_path),
+                    mode=0o700,
+                    exist_ok=True)
+        lock_file = open(f"{self.token_cache_path}.lock", 'a')
+        while True:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                break
+            except BlockingIOError:
+                if time.monotonic() >= deadline:
+                    lock_file.close()
+                    raise TimeoutError(
+                        "Timed out waiting for another process to refresh "
+                        "the Instagram token")
+                time.sleep(0.1)
+        self._refresh_lock_file = lock_file
+
+    @classmethod
+    @functools.lru_cache(maxsize=4)
+    def _load_google_credentials(cls, project_id, private_key_id, private_key,
+                                 client_email, client_id):
+        """
+        Builds service account credentials from the individual GCP fields.
+        Cached per process, so each private key is only decoded once no matter
+        how many pipelines are created.
         """
         credentials_info = {
             "type":
             "service_account",
             "project_id":
-            self.gcp_project_id,
+            project_id,
             "private_key_id":
-            self.gcp_private_key_id,
+            private_key_id,
             "private_key":
-            self.gcp_private_key.replace('\\n', '\n'),
+            private_key.replace('\\n', '\n'),
             "client_email":
-            self.gcp_client_email,
+            client_email,
             "client_id":
-            self.gcp_client_id,
+            client_id,
             "auth_uri":
-            self.GOOGLE_AUTH_URI,
+            cls.GOOGLE_AUTH_URI,
             "token_uri":
-            self.GOOGLE_TOKEN_URI,
+            cls.GOOGLE_TOKEN_URI,
             "auth_provider_x509_cert_url":
-            self.GOOGLE_CERTS_URL,
+            cls.GOOGLE_CERTS_URL,
             "client_x509_cert_url":
-            f"https://www.googleapis.com/robot/v1/metadata/x509/{urllib.parse.quote(self.gcp_client_email)}",
+            f"https://www.googleapis.com/robot/v1/metadata/x509/{urllib.parse.quote(client_email)}",
         }
-        self.google_creds = service_account.Credentials.from_service_account_info(
+        # Imported here to keep the Google client libraries off the startup path
+        from google.oauth2 import service_account
+        return service_account.Credentials.from_service_account_info(
             credentials_info)
+
+    def _authenticate_google(self):
+        """
+        Authenticates with Google Cloud using the provided scopes.
+        Returns a credentials object.
+        """
+        # Build the storage client once, even when uploads start in
+        # parallel; it owns its own authorized session
+        with self._gcs_client_lock:
+            if self.gcs_bucket is None:
+                # Imported here to keep the Google client libraries off the
+                # startup path
+                from google.cloud import storage
+
+                self.google_creds = self._load_google_credentials(
+                    self.gcp_project_id, self.gcp_private_key_id,
+                    self.gcp_private_key, self.gcp_client_email,
+                    self.gcp_client_id)
+                self.gcs_client = storage.Client(
+                    credentials=self.google_creds,
+                    project=self.gcp_project_id)
+                self.gcs_bucket = self.gcs_client.bucket(self.gcs_bucket_name)
         self._update_progress("google_auth", "Authenticated with Google Cloud")
         return self.google_creds
 
+    def _start_oauth_listener(self):
+        """
+        Starts a one-shot HTTP listener on the redirect URI when it points at
+        plain-HTTP localhost, so the OAuth code is captured automatically.
+        Returns a (server, codes) pair, or None if the redirect URI can't be
+        served locally.
+        """
+        redirect = urllib.parse.urlparse(self.redirect_uri)
+        if (redirect.scheme != "http"
+                or redirect.hostname not in ("localhost", "127.0.0.1")):
+            return None
+
+        codes = queue.Queue()
+
+        class OAuthCodeHandler(http.server.BaseHTTPRequestHandler):
+
+            def do_GET(handler):
+                query = urllib.parse.parse_qs(
+                    urllib.parse.urlparse(handler.path).query)
+                code = query.get('code', [None])[0]
+                handler.send_response(200 if code else 400)
+                handler.send_header("Content-Type", "text/html")
+                handler.end_headers()
+                handler.wfile.write(
+                    b"Authorization received. You can close this window."
+                    if code else b"No authorization code in the redirect.")
+                if code:
+                    codes.put(code)
+
+            def log_message(handler, format, *args):
+                pass  # keep request logs out of the progress output
+
+        try:
+            server = http.server.ThreadingHTTPServer(
+                (redirect.hostname, redirect.port or 80), OAuthCodeHandler)
+        except OSError as e:
+            logging.warning(
+                f"Could not listen for the OAuth redirect on {self.redirect_uri}: {e}"
+            )
+            return None
+        threading.Thread(target=server.serve_forever,
+                         name="clipmorph-instagram-oauth",
+                         daemon=True).start()
+        return server, codes
+
     def get_user_access_token(self):
         """
         Guides user through browser-based OAuth to obtain a user access token.
+        With an http://localhost redirect URI the code is captured from the
+        redirect automatically; otherwise it is pasted in by the user.
         """
-        oauth_url = (
-            f"{self.FACEBOOK_AUTH_BASE_URL}/{self.api_version}/dialog/oauth"
-            f"?client_id={self.app_id}"
-            f"&redirect_uri={self.redirect_uri}"
-            f"&scope={','.join(self.auth_scopes)}"
-            f"&response_type=code")
+        listener = self._start_oauth_listener()
         print("Open this URL in your browser and authorize the app:")
-        print(oauth_url)
-        webbrowser.open(oauth_url)
-        code = input(
-            "Paste the 'code' parameter from the redirect URL here: ").strip()
+        print(self._oauth_dialog_url)
+        webbrowser.open(self._oauth_dialog_url)
+        if listener:
+            server, codes = listener
+            try:
+                code = codes.get(timeout=self.OAUTH_CALLBACK_TIMEOUT)
+            except queue.Empty:
+                raise TimeoutError(
+                    "Timed out waiting for the OAuth redirect") from None
+            finally:
+                server.shutdown()
+                server.server_close()
+        else:
+            code = input(
+                "Paste the 'code' parameter from the redirect URL here: "
+            ).strip()
 
         # Exchange code for access token
-        token_url = (
-            f"{self.FACEBOOK_GRAPH_BASE_URL}/{self.api_version}/oauth/access_token"
-            f"?client_id={self.app_id}"
-            f"&redirect_uri={self.redirect_uri}"
-            f"&client_secret={self.app_secret}"
-            f"&code={code}")
-        resp = self._retry_request(requests.get,
-                                   token_url,
-                                   timeout=self.request_timeout)
-        data = resp.json()
+        data = self._graph_request("GET",
+                                   "oauth/access_token",
+                                   params={
+                                       "client_id": self.app_id,
+                                       "redirect_uri": self.redirect_uri,
+                                       "client_secret": self.app_secret,
+                                       "code": code
+                                   }).json()
         return data['access_token']
 
+    def _exchange_for_long_lived_token(self, token):
+        """
+        Exchanges a short-lived or long-lived user token for a new long-lived
+        one.
+
+        Returns:
+            tuple: (access_token, expires_at), where expires_at is a Unix
+                timestamp or None if Graph didn't report a lifetime
+        """
+        data = self._graph_request("GET",
+                                   "oauth/access_token",
+                                   params={
+                                       "grant_type": "fb_exchange_token",
+                                       "client_id": self.app_id,
+                                       "client_secret": self.app_secret,
+                                       "fb_exchange_token": token
+                                   }).json()
+        expires_in = data.get("expires_in")
+        expires_at = time.time() + expires_in if expires_in else None
+        return data["access_token"], expires_at
+
     def _generate_long_lived_access_token(self):
-        """Generates a long-lived access token from a short-lived one."""
-        response = self._retry_request(
-            requests.get,
-            f"{self.FACEBOOK_GRAPH_BASE_URL}/{self.api_version}/oauth/access_token",
-            params={
-                "grant_type": "fb_exchange_token",
-                "client_id": self.app_id,
-                "client_secret": self.app_secret,
-                "fb_exchange_token": self.get_user_access_token()
-            },
-            timeout=self.request_timeout)
-        logging.info(f"Access token: {response.json()['access_token']}")
-        return response.json()["access_token"]
+        """
+        Generates a long-lived access token from a short-lived one. Leaves
+        the pipeline's tokens untouched, so it can run without the token
+        refresh lock.
+
+        Returns:
+            tuple: (access_token, expires_at), as from
+                _exchange_for_long_lived_token
+        """
+        access_token, expires_at = self._exchange_for_long_lived_token(
+            self.get_user_access_token())
+        logging.info("Access token: %s", access_token)
+        return access_token, expires_at
+
+    def _refresh_access_token(self, stale_token=None):
+        """
+        Exchanges the current long-lived access token for a fresh one,
+        persists it and schedules the next background refresh. If another
+        thread replaced stale_token while this one waited, that token is kept.
+        """
+        if stale_token is None:
+            stale_token = self.access_token
+        with self._token_refresh_guard():
+            if self.access_token != stale_token:
+                return self.access_token
+            self.access_token, self.access_token_expires_at = (
+                self._exchange_for_long_lived_token(self.access_token))
+            self._save_cached_tokens()
+        self._schedule_token_refresh()
+        return self.access_token
+
+    def _schedule_token_refresh(self, delay=None):
+        """
+        Schedules a background refresh of the access token. By default it runs
+        once EARLY_TOKEN_REFRESH_FRACTION of the token lifetime has passed.
+        """
+        if delay is None:
+            if not self.access_token_expires_at:
+                return
+            refresh_at = self.access_token_expires_at - (
+                1 - self.EARLY_TOKEN_REFRESH_FRACTION
+            ) * self.LONG_LIVED_TOKEN_LIFETIME
+            delay = max(0, refresh_at - time.time())
+
+        # The timer is shared with other instances using the same tokens
+        with self._refresh_lock:
+            if self._refresh_timer:
+                self._refresh_timer.cancel()
+            self._refresh_timer = threading.Timer(
+                delay, self._background_refresh_access_token)
+            self._refresh_timer.daemon = True
+            self._refresh_timer.start()
+
+    def _background_refresh_access_token(self):
+        """
+        Timer callback that refreshes the access token, retrying with
+        exponential backoff until the current token expires. The page token
+        is renewed from the fresh user token too, so uploads keep using the
+        current one and never wait on the fetch.
+        """
+        try:
+            self._refresh_access_token()
+            self._refresh_failures = 0
+        except Exception as e:
+            self._refresh_failures += 1
+            remaining = (self.access_token_expires_at or 0) - time.time()
+            if remaining <= 0:
+                logging.warning(
+                    f"Instagram access token expired and could not be refreshed: {e}"
+                )
+                return
+            delay = min(
+                remaining / 2, self.TOKEN_REFRESH_RETRY_DELAY *
+                2**(self._refresh_failures - 1))
+            logging.warning(
+                f"Background Instagram token refresh failed, retrying in {delay:.0f}s: {e}"
+            )
+            self._schedule_token_refresh(delay)
+            return
+
+        if self.page_token:
+            try:
+                self._renew_graph_token("page", self.page_token)
+            except Exception as e:
+                # The old page token stays in use; a Graph rejection renews it
+                logging.warning(
+                    f"Background Instagram page token refresh failed: {e}")
 
     def _get_page_access_token(self):
         """
         Exchanges a user access token for a page access token.
         """
-        url = f"{self.FACEBOOK_GRAPH_BASE_URL}/{self.api_version}/{self.page_id}?fields=access_token&access_token={self.access_token}"
-        resp = self._retry_request(requests.get,
-                                   url,
-                                   timeout=self.request_timeout)
+        resp = self._graph_request("GET",
+                                   self.page_id,
+                                   token="user",
+                                   params={"fields": "access_token"})
         self.page_token = resp.json()['access_token']
         self._update_progress("page_token", "Got page access token")
         return self.page_token
@@ -256,48 +682,290 @@ class InstagramUploadPipeline(BaseUploadPipeline):
         if not self.page_token:
             self._get_page_access_token()
 
-        url = f"{self.FACEBOOK_GRAPH_BASE_URL}/{self.api_version}/{self.page_id}?fields=instagram_business_account&access_token={self.page_token}"
-        resp = self._retry_request(requests.get,
-                                   url,
-                                   timeout=self.request_timeout)
+        resp = self._graph_request(
+            "GET",
+            self.page_id,
+            token="page",
+            params={"fields": "instagram_business_account"})
         self.ig_user_id = resp.json()['instagram_business_account']['id']
         self._update_progress("ig_user_id", "Got Instagram user ID")
         return self.ig_user_id
 
-    def _upload_video(self, video_path):
+    def _get_page_context(self):
+        """
+        Gets the page access token and the connected Instagram user ID in a
+        single Graph API round-trip using the user access token.
+        """
+        data = self._graph_request(
+            "GET",
+            self.page_id,
+            token="user",
+            params={
+                "fields": "access_token,instagram_business_account"
+            }).json()
+        self.page_token = data['access_token']
+        self._update_progress("page_token", "Got page access token")
+        self.ig_user_id = data['instagram_business_account']['id']
+        self._update_progress("ig_user_id", "Got Instagram user ID")
+        return self.page_token, self.ig_user_id
+
+    def _token_cache_key(self):
+        """Returns the cache key for this app/page pair without storing raw IDs."""
+        return hashlib.sha256(
+            f"{self.app_id}:{self.page_id}".encode('utf-8')).hexdigest()
+
+    def _load_cached_tokens(self):
+        """
+        Fills in the access token, page token and Instagram user ID from the
+        token cache. Expired access tokens are skipped.
+        """
+        cache = self._read_json_cache(self.token_cache_path, "token cache")
+        entry = cache.get(self._token_cache_key())
+        if not entry:
+            return
+
+        expires_at = entry.get('access_token_expires_at')
+        if (not self.access_token and entry.get('access_token')
+                and (expires_at is None or expires_at > time.time())):
+            self.access_token = entry['access_token']
+            self.access_token_expires_at = expires_at
+
+        self.page_token = self.page_token or entry.get('page_token')
+        self.ig_user_id = self.ig_user_id or entry.get('ig_user_id')
+
+    def _save_cached_tokens(self):
+        """Writes the current tokens and user ID to the token cache (mode 0600)."""
+        if not self.token_cache_path:
+            return
+
+        cache = self._read_json_cache(self.token_cache_path, "token cache")
+        cache[self._token_cache_key()] = {
+            'access_token': self.access_token,
+            'access_token_expires_at': self.access_token_expires_at,
+            'page_token': self.page_token,
+            'ig_user_id': self.ig_user_id,
+        }
+        self._write_json_cache_atomic(self.token_cache_path, cache,
+                                      "token cache")
+
+    def _prepare_graph_access(self):
+        """
+        Obtains the user access token, page access token and Instagram user ID,
+        in that order, skipping any that are already known or cached. Cache
+        reads, refreshes and writes run under the token refresh lock, but the
+        interactive OAuth flow doesn't: it can wait minutes on the user, far
+        longer than other uploads wait for the lock.
+        """
+        with self._token_refresh_guard():
+            if self._load_access_token_locked():
+                self._finish_graph_access_locked()
+                return
+
+        with self._oauth_flow_lock:
+            # Another upload may have finished an OAuth flow while this one
+            # waited for its turn
+            with self._token_refresh_guard():
+                if self._load_access_token_locked():
+                    self._finish_graph_access_locked()
+                    return
+
+            if self.progress_bar:
+                self.progress_bar.write(
+                    "[Instagram] No access token found. Starting OAuth flow...")
+            access_token, expires_at = self._generate_long_lived_access_token()
+
+            with self._token_refresh_guard():
+                self.access_token = access_token
+                self.access_token_expires_at = expires_at
+                # Persist right away so a failure below doesn't cost another
+                # OAuth
+                self._save_cached_tokens()
+                self._finish_graph_access_locked()
+
+        if self.progress_bar:
+            self.progress_bar.write(
+                "\nIMPORTANT: To skip the manual OAuth process in future runs, "
+                "set this access token in your environment:\n"
+                f"FACEBOOK_ACCESS_TOKEN={self.access_token}\n")
+
+    def _load_access_token_locked(self):
+        """
+        Fills in tokens from the cache and refreshes an access token that is
+        about to expire. The caller holds the refresh lock.
+
+        Returns:
+            bool: Whether a usable access token is available
+        """
+        if not (self.access_token and self.page_token and self.ig_user_id):
+            self._load_cached_tokens()
+
+        # Refresh inline if the token is about to expire; the background
+        # refresh normally gets there first
+        if (self.access_token and self.access_token_expires_at
+                and self.access_token_expires_at - time.time() <
+                self.TOKEN_REFRESH_MARGIN):
+            try:
+                self._refresh_access_token()
+            except Exception as e:
+                logging.warning(
+                    f"Failed to refresh Instagram access token: {e}")
+                self.access_token = None
+
+        return bool(self.access_token)
+
+    def _finish_graph_access_locked(self):
         """
-        Uploads a video to Google Cloud Storage and makes it public.
-        Returns the public URL to the uploaded video.
+        Fetches whichever of the page token and Instagram user ID is missing,
+        caches them and schedules the background token refresh. The caller
+        holds the refresh lock.
         """
-        if not os.path.exists(video_path):
-            raise FileNotFoundError(f"Video file not found: {video_path}")
-        if not self.google_creds:
+        cached = (self.page_token, self.ig_user_id)
+
+        if not (self.page_token or self.ig_user_id):
+            self._get_page_context()
+        elif not self.page_token:
+            self._get_page_access_token()
+        elif not self.ig_user_id:
+            self._get_ig_user_id()
+
+        if (self.page_token, self.ig_user_id) != cached:
+            self._save_cached_tokens()
+
+        if not self._refresh_timer:
+            self._schedule_token_refresh()
+
+    def _stat_video(self, video_path):
+        """
+        Returns the size of a video file in bytes with a single stat call.
+        """
+        try:
+            return os.stat(video_path).st_size
+        except FileNotFoundError:
+            raise FileNotFoundError(
+                f"Video file not found: {video_path}") from None
+
+    def _upload_blob(self, video_path, size=None):
+        """
+        Uploads a video to Google Cloud Storage without touching the progress bar.
+        Each upload gets its own blob name, so concurrent uploads of files
+        with the same name never overwrite each other. The blob itself does
+        not need to be public. Pass size when the file has already been
+        checked to skip another stat.
+
+        Returns:
+            tuple: (video_url, blob_name), where video_url is a short-lived
+                signed URL Instagram can fetch the video from
+        """
+        if size is None:
+            size = self._stat_video(video_path)
+        if not self.gcs_bucket:
             self._authenticate_google()
+        from google.cloud.storage.retry import DEFAULT_RETRY
 
-        destination_blob_name = os.path.basename(video_path)
-        storage_client = storage.Client(credentials=self.google_creds)
-        bucket = storage_client.bucket(self.gcs_bucket_name)
-        blob = bucket.blob(destination_blob_name)
-        blob.upload_from_filename(video_path)
+        destination_blob_name = (
+            f"{uuid.uuid4().hex}-{os.path.basename(video_path)}")
+        blob = self.gcs_bucket.blob(destination_blob_name,
+                                    chunk_size=self.GCS_UPLOAD_CHUNK_SIZE)
+        content_type = mimetypes.guess_type(video_path)[0] or "video/mp4"
+
+        # Stream from our own handle so the resumable upload reads one chunk
+        # at a time with a known size
+        with open(video_path, 'rb') as video_file:
+            blob.upload_from_file(video_file,
+                                  rewind=False,
+                                  size=size,
+                                  content_type=content_type,
+                                  timeout=self.GCS_UPLOAD_TIMEOUT,
+                                  checksum="crc32c",
+                                  retry=DEFAULT_RETRY)
+        self._blob_generations[destination_blob_name] = blob.generation
+        video_url = blob.generate_signed_url(
+            version="v4",
+            expiration=self.GCS_SIGNED_URL_EXPIRATION,
+            method="GET")
+        return video_url, destination_blob_name
+
+    def _upload_video(self, video_path, size=None):
+        """
+        Uploads a video to Google Cloud Storage.
+        Returns the (video_url, blob_name) pair from _upload_blob.
+        """
+        uploaded = self._upload_blob(video_path, size)
         self._update_progress("video_upload",
                               "Video uploaded to cloud storage")
-        return blob.public_url
+        return uploaded
 
-    def _delete_video(self, video_path):
+    def _delete_video(self, blob_name):
         """
-        Deletes a video from Google Cloud Storage.
+        Deletes an uploaded video from Google Cloud Storage. Only the
+        generation this pipeline uploaded is deleted, so a newer upload under
+        the same name is left alone.
         """
-        if not self.google_creds:
+        if not self.gcs_bucket:
             self._authenticate_google()
 
-        blob_name = os.path.basename(video_path)
-        storage_client = storage.Client(credentials=self.google_creds)
-        bucket = storage_client.bucket(self.gcs_bucket_name)
-        blob = bucket.blob(blob_name)
-        blob.delete()
-        self._update_progress("cleanup", "Cleaned up temporary files")
+        blob = self.gcs_bucket.blob(blob_name)
+        blob.delete(if_generation_match=self._blob_generations.pop(
+            blob_name, None))
         return True
 
+    def _discard_upload(self, upload_future):
+        """
+        Waits for an upload whose reel won't be created and deletes its blob
+        if it reached cloud storage.
+        """
+        try:
+            _, blob_name = upload_future.result()
+        except Exception:
+            return
+        try:
+            self._delete_video(blob_name)
+        except Exception as e:
+            logging.warning(
+                f"Failed to delete {blob_name} from cloud storage: {e}")
+
+    def _delete_video_in_background(self, blob_name):
+        """
+        Deletes a video from Google Cloud Storage on the shared executor so
+        the caller doesn't wait on it. Executor threads are joined at exit,
+        so the interpreter still finishes the delete before exiting.
+        """
+
+        def delete():
+            try:
+                self._delete_video(blob_name)
+            except Exception as e:
+                logging.warning(
+                    f"Failed to delete {blob_name} from cloud storage: {e}")
+
+        self._executor.submit(delete)
+        self._update_progress("cleanup", "Cleaning up temporary files")
+
+    def close(self):
+        """
+        Waits for pending uploads and cleanups, stops the background token
+        refresh and closes the Graph API session. Another instance sharing
+        the tokens reschedules the refresh on its next upload.
+        """
+        self._executor.shutdown(wait=True)
+        with self._refresh_lock:
+            if self._refresh_timer:
+                self._refresh_timer.cancel()
+                self._refresh_timer = None
+        self.session.close()
+
+    def _throttle_media_create(self):
+        """
+        Spaces out media container creation to stay under the Graph API's
+        per-second limit on the /media endpoint.
+        """
+        with self._media_create_lock:
+            wait = (self._last_media_create +
+                    self.MEDIA_CREATE_MIN_INTERVAL - time.monotonic())
+            if wait > 0:
+                time.sleep(wait)
+            self._last_media_create = time.monotonic()
+
     def _create_reel_container(self,
                                video_url,
                                caption,
@@ -309,20 +977,19 @@ class InstagramUploadPipeline(BaseUploadPipeline):
         if not self.ig_user_id:
             self._get_ig_user_id()
 
-        url = f"{self.FACEBOOK_GRAPH_BASE_URL}/{self.api_version}/{self.ig_user_id}/media"
         payload = {
             'media_type': 'REELS',
             'video_url': video_url,
             'caption': caption,
-            'access_token': self.page_token,
             'share_to_feed': 'true' if share_to_feed else 'false',
         }
         if thumb_offset is not None:
             payload['thumb_offset'] = str(thumb_offset)
-        resp = self._retry_request(requests.post,
-                                   url,
-                                   data=payload,
-                                   timeout=self.request_timeout)
+        self._throttle_media_create()
+        resp = self._graph_request("POST",
+                                   f"{self.ig_user_id}/media",
+                                   token="page",
+                                   data=payload)
         self._update_progress("create_container", "Created reel container")
         return resp.json()['id']
 
@@ -336,25 +1003,91 @@ class InstagramUploadPipeline(BaseUploadPipeline):
         if not self.ig_user_id:
             self._get_ig_user_id()
 
-        url = f"{self.FACEBOOK_GRAPH_BASE_URL}/{self.api_version}/{self.ig_user_id}/media_publish"
-        payload = {'creation_id': creation_id, 'access_token': self.page_token}
-        resp = self._retry_request(requests.post,
-                                   url,
-                                   data=payload,
-                                   timeout=self.request_timeout)
+        resp = self._graph_request("POST",
+                                   f"{self.ig_user_id}/media_publish",
+                                   token="page",
+                                   data={'creation_id': creation_id})
 
         # Update description to show completion
         if self.progress_bar:
             self.progress_bar.set_description("[Instagram] Cleaning up...")
         return resp.json()['id']
 
-    def _wait_for_processing(self, creation_id, video_size_mb=0):
+    def _next_poll_delay(self, attempt, response):
+        """
+        Returns the delay before the next status check: exponential backoff
+        with jitter, extended to any Retry-After the API asked for.
+        """
+        delay = min(
+            self.API_POLL_MAX_DELAY, self.API_POLL_INITIAL_DELAY *
+            self.API_POLL_BACKOFF_FACTOR**attempt) + random.uniform(
+                0, self.API_POLL_JITTER)
+
+        retry_after = self._retry_after_seconds(response)
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
+
+    def _start_processing_poller(self, creation_id):
         """
-        Polls the media container status until it's finished processing.
+        Starts a background thread that polls the media container status.
+        Returns a (done_event, outcome) pair; done_event is set once outcome
+        holds a final status, an error, or nothing (timed out).
+        """
+        done_event = threading.Event()
+        outcome = {'status': None, 'media_status': None, 'error': None}
+        threading.Thread(target=self._poll_processing_status,
+                         args=(creation_id, done_event, outcome),
+                         name=f"clipmorph-instagram-poll-{creation_id}",
+                         daemon=True).start()
+        return done_event, outcome
+
+    def _poll_processing_status(self, creation_id, done_event, outcome):
+        """
+        Polls the media container status on an exponential backoff schedule
+        until it finishes, fails or processing_timeout elapses.
         """
-        url = f"{self.FACEBOOK_GRAPH_BASE_URL}/{self.api_version}/{creation_id}?fields=status_code&access_token={self.page_token}"
         start = time.time()
-        last_api_call = 0
+        delay = self.API_POLL_INITIAL_DELAY
+        poll_attempt = 0
+
+        try:
+            while True:
+                remaining = self.processing_timeout - (time.time() - start)
+                if remaining <= 0:
+                    return
+                time.sleep(min(delay, remaining))
+
+                resp = self._graph_request("GET",
+                                           creation_id,
+                                           token="page",
+                                           params={"fields": "status_code"},
+                                           timeout=10)
+                media_status = resp.json()
+                status = media_status.get('status_code')
+                if status in ('FINISHED', 'ERROR'):
+                    outcome['status'] = status
+                    outcome['media_status'] = media_status
+                    return
+
+                delay = self._next_poll_delay(poll_attempt, resp)
+                poll_attempt += 1
+        except Exception as e:
+            outcome['error'] = e
+        finally:
+            done_event.set()
+
+    def _wait_for_processing(self, creation_id, video_size_mb=0, poller=None):
+        """
+        Waits for the media container to finish processing, advancing the
+        progress bar while a background poller checks its status.
+        A poller from _start_processing_poller can be passed in if one was
+        started earlier.
+        """
+        if poller is None:
+            poller = self._start_processing_poller(creation_id)
+        done_event, outcome = poller
+        start = time.time()
 
         # Calculate increment per second based on expected processing time
         estimated_time = max(
@@ -365,73 +1098,111 @@ class InstagramUploadPipeline(BaseUploadPipeline):
             self.MAX_PROGRESS_DURING_PROCESSING / estimated_time)
 
         current_progress = self.progress_bar.n if self.progress_bar else 0
-        status = None
 
-        while time.time() - start < self.processing_timeout:
+        # Tick once a second for progress until the poller reports back
+        while not done_event.wait(timeout=1):
             elapsed = time.time() - start
 
-            # Only fetch API status every few seconds
-            if elapsed - last_api_call >= self.API_POLL_INTERVAL:
-                resp = self._retry_request(requests.get, url, timeout=10)
-                media_status = resp.json()
-                status = media_status.get('status_code')
-                last_api_call = elapsed
-
             # Progressive updates based on video size and elapsed time
             target_progress = current_progress + min(
                 elapsed * increment_per_check,
                 self.MAX_PROGRESS_DURING_PROCESSING)
 
-            # Update the timer description every second
-            if self.progress_bar:
-                self.progress_bar.set_description(
-                    f"[Instagram] Processing video... ({elapsed:.0f}s)")
+            if not self.progress_bar:
+                continue
+
+            # Update the timer description without redrawing; the progress
+            # update below (or an explicit refresh) draws both at once
+            self.progress_bar.set_description(
+                f"[Instagram] Processing video... ({elapsed:.0f}s)",
+                refresh=False)
 
             # Only update progress if we haven't reached the cap
-            if self.progress_bar and self.progress_bar.n < target_progress and self.progress_bar.n < self.MAX_PROGRESS_DURING_PROCESSING:
+            increment = 0
+            if self.progress_bar.n < target_progress and self.progress_bar.n < self.MAX_PROGRESS_DURING_PROCESSING:
                 increment = min(
                     increment_per_check, target_progress - self.progress_bar.n,
                     self.MAX_PROGRESS_DURING_PROCESSING - self.progress_bar.n)
-                if increment > 0:
-                    self.progress_bar.update(increment)
-
-            if status == 'FINISHED':
-                if self.progress_bar:
-                    self.progress_bar.set_description(
-                        "[Instagram] Publishing reel...")
-                return True
-            elif status == 'ERROR':
-                # Try to get more detailed error info from various possible locations
-                error_info = media_status.get('error', {})
-                error_msg = media_status.get('message', '')
-                error_type = media_status.get('error_type', '')
+            if increment > 0:
+                self.progress_bar.update(increment)
+            else:
+                self.progress_bar.refresh()
+
+        if outcome['error']:
+            raise outcome['error']
+
+        status = outcome['status']
+        media_status = outcome['media_status']
+
+        if status == 'FINISHED':
+            if self.progress_bar:
+                self.progress_bar.set_description(
+                    "[Instagram] Publishing reel...")
+            return True
+        elif status == 'ERROR':
+            # Try to get more detailed error info from various possible locations
+            error_info = media_status.get('error', {})
+            error_msg = media_status.get('message', '')
+            error_type = media_status.get('error_type', '')
+            
+            if error_info or error_msg or error_type:
+                # We have some error details
+                details = []
+                if error_msg:
+                    details.append(error_msg)
+                if error_type:
+                    details.append(f"Type: {error_type}")
+                if error_info and isinstance(error_info, dict):
+                    if 'message' in error_info:
+                        details.append(error_info['message'])
+                    if 'code' in error_info:
+                        details.append(f"Code: {error_info['code']}")
                 
-                if error_info or error_msg or error_type:
-                    # We have some error details
-                    details = []
-                    if error_msg:
-                        details.append(error_msg)
-                    if error_type:
-                        details.append(f"Type: {error_type}")
-                    if error_info and isinstance(error_info, dict):
-                        if 'message' in error_info:
-                            details.append(error_info['message'])
-                        if 'code' in error_info:
-                            details.append(f"Code: {error_info['code']}")
-                    
-                    raise RuntimeError(f"Instagram video processing failed: {' | '.join(details)}")
-                else:
-                    # No specific error details - provide common causes
-                    media_id = media_status.get('id', 'unknown')
-                    raise RuntimeError(
-                        f"Instagram video processing failed (ID: {media_id}). "
-                        "Common causes: unsupported video format, file too large, invalid aspect ratio, or temporary Instagram API issue."
-                    )
-
-            time.sleep(1)
+                raise RuntimeError(f"Instagram video processing failed: {' | '.join(details)}")
+            else:
+                # No specific error details - provide common causes
+                media_id = media_status.get('id', 'unknown')
+                raise RuntimeError(
+                    f"Instagram video processing failed (ID: {media_id}). "
+                    "Common causes: unsupported video format, file too large, invalid aspect ratio, or temporary Instagram API issue."
+                )
 
         raise TimeoutError("Timed out waiting for video processing.")
 
+    def _publish_reel(self, blob_name, creation_id, video_size_mb,
+                      poller=None):
+        """
+        Waits for a reel container to finish processing and publishes it,
+        then deletes the temporary copy from cloud storage.
+        Returns the media ID of the published reel.
+        """
+        upload_success = False
+        media_id = None
+        failure_reason = None
+
+        try:
+            self._wait_for_processing(creation_id,
+                                      video_size_mb=video_size_mb,
+                                      poller=poller)
+            media_id = self._publish_media(creation_id)
+            upload_success = True
+        except (TimeoutError, RuntimeError) as e:
+            failure_reason = str(e)
+        except Exception as e:
+            failure_reason = f"Unexpected error during processing: {str(e)}"
+        finally:
+            self._delete_video_in_background(blob_name)
+
+        # Handle progress bar completion based on success/failure
+        if upload_success:
+            self._complete_progress_bar(True)
+        else:
+            self._complete_progress_bar(False)
+            error_msg = failure_reason or "Instagram upload failed during video processing or publishing"
+            raise RuntimeError(error_msg)
+
+        return media_id
+
     def run(self,
             video_path,
             caption: str,
@@ -452,68 +1223,143 @@ class InstagramUploadPipeline(BaseUploadPipeline):
             str: Media ID of the uploaded reel
         """
         # Get video file size for progress estimation
-        if not os.path.exists(video_path):
-            raise FileNotFoundError(f"Video file not found: {video_path}")
-        video_size_mb = os.path.getsize(video_path) / (1024 * 1024)
+        video_size = self._stat_video(video_path)
+        video_size_mb = video_size / (1024 * 1024)
 
-        total_progress = sum(self.progress_allocations.values())
-        upload_success = False
+        total_progress = self._total_progress
         media_id = None
-        failure_reason = None
 
         with self._progress_context(total_progress, "Starting upload"):
+            upload_future = graph_future = None
+            publishing = False
             try:
                 # Initialize credentials if not already done
-                if not self.google_creds:
+                if not self.gcs_bucket:
                     self._authenticate_google()
 
-                # Upload to temporary storage
-                video_url = self._upload_video(video_path)
-
-                # Get necessary tokens and IDs
-                if not self.access_token:
-                    self.progress_bar.write(
-                        "[Instagram] No access token found. Starting OAuth flow..."
-                    )
-                    self.access_token = self._generate_long_lived_access_token(
-                    )
-                    self.progress_bar.write(
-                        "\nIMPORTANT: To skip the manual OAuth process in future runs, "
-                        "set this access token in your environment:\n"
-                        f"FACEBOOK_ACCESS_TOKEN={self.access_token}\n")
-
-                # Get necessary tokens and IDs
-                if not self.page_token:
-                    self._get_page_access_token()
-
-                if not self.ig_user_id:
-                    self._get_ig_user_id()
-
-                # Create and process the reel
+                # Upload to temporary storage while fetching tokens and IDs;
+                # the two only meet when the reel container is created
+                upload_future = self._executor.submit(self._upload_video,
+                                                      video_path, video_size)
+                graph_future = self._executor.submit(
+                    self._prepare_graph_access)
+                # A failed upload shouldn't wait on the token chain, which
+                # may be sitting in the interactive OAuth flow
+                wait((upload_future, graph_future),
+                     return_when=FIRST_EXCEPTION)
+                if upload_future.done():
+                    upload_future.result()
+                graph_future.result()
+                video_url, blob_name = upload_future.result()
+
+                # Create and process the reel; publishing cleans up the blob
                 creation_id = self._create_reel_container(
                     video_url, caption, share_to_feed, thumb_offset)
-
-                try:
-                    self._wait_for_processing(creation_id, video_size_mb=video_size_mb)
-                    media_id = self._publish_media(creation_id)
-                    upload_success = True
-                except (TimeoutError, RuntimeError) as e:
-                    failure_reason = str(e)
-                except Exception as e:
-                    failure_reason = f"Unexpected error during processing: {str(e)}"
-                finally:
-                    self._delete_video(video_path)
-
-                # Handle progress bar completion based on success/failure
-                if upload_success:
-                    self._complete_progress_bar(True)
-                else:
-                    self._complete_progress_bar(False)
-                    error_msg = failure_reason or "Instagram upload failed during video processing or publishing"
-                    raise RuntimeError(error_msg)
+                publishing = True
+                media_id = self._publish_reel(blob_name, creation_id,
+                                              video_size_mb)
 
             except Exception as e:
+                if graph_future:
+                    graph_future.cancel()
+                if upload_future and not publishing:
+                    self._discard_upload(upload_future)
                 self._complete_progress_bar(False)
                 raise
 
         return media_id
+
+    def run_batch(self,
+                  jobs,
+                  share_to_feed: bool = True,
+                  thumb_offset: int = None):
+        """
+        Uploads several Instagram Reels, authenticating and resolving tokens
+        only once. Cloud storage uploads run in the background and each reel's
+        container starts processing as soon as its upload finishes, so
+        processing of all reels overlaps before they are published in order.
+        
+        Args:
+            jobs (list): List of (video_path, caption) tuples
+            share_to_feed (bool, optional): Whether to share the reels to the main feed.
+                Defaults to True.
+            thumb_offset (int, optional): Thumbnail offset in milliseconds.
+                Defaults to None (auto-generated).
+                
+        Returns:
+            list: One result dictionary per job, in order, with video_path,
+                success, result (media ID) and error keys
+        """
+        if not jobs:
+            return []
+
+        video_sizes = [self._stat_video(video_path) for video_path, _ in jobs]
+
+        # Shared setup, done once for the whole batch
+        if not self.gcs_bucket:
+            self._authenticate_google()
+        self._prepare_graph_access()
+
+        total_progress = self._total_progress
+        results = [None] * len(jobs)
+        pending = []
+
+        upload_futures = [
+            self._executor.submit(self._upload_blob, video_path, size)
+            for (video_path, _), size in zip(jobs, video_sizes)
+        ]
+
+        # Create containers as uploads land and start polling them all
+        for index, ((video_path, caption), upload_future) in enumerate(
+                zip(jobs, upload_futures)):
+            blob_name = None
+            try:
+                video_url, blob_name = upload_future.result()
+                creation_id = self._create_reel_container(
+                    video_url, caption, share_to_feed, thumb_offset)
+                pending.append(
+                    (index, video_path, blob_name, creation_id,
+                     self._start_processing_poller(creation_id)))
+            except Exception as e:
+                if blob_name:
+                    try:
+                        self._delete_video(blob_name)
+                    except Exception as cleanup_error:
+                        logging.warning(
+                            f"Failed to delete {video_path} from cloud storage: {cleanup_error}"
+                        )
+                results[index] = {
+                    'video_path': video_path,
+                    'success': False,
+                    'result': None,
+                    'error': str(e)
+                }
+
+        # Publish in order, each with its own progress bar
+        for index, video_path, blob_name, creation_id, poller in pending:
+            video_size_mb = video_sizes[index] / (1024 * 1024)
+
+            with self._progress_context(total_progress, "Starting upload"):
+                try:
+                    self._update_progress("video_upload",
+                                          "Video uploaded to cloud storage")
+                    self._update_progress("create_container",
+                                          "Created reel container")
+                    media_id = self._publish_reel(blob_name, creation_id,
+                                                  video_size_mb, poller)
+                    results[index] = {
+                        'video_path': video_path,
+                        'success': True,
+                        'result': media_id,
+                        'error': None
+                    }
+                except Exception as e:
+                    self._complete_progress_bar(False)
+                    results[index] = {
+                        'video_path': video_path,
+                        'success': False,
+                        'result': None,
+                        'error': str(e)
+                    }
+
+        return results
@@ -1,12 +1,51 @@
+import atexit
 import hashlib
+import json
+import logging
 import os
 import secrets
+import threading
 import time
 import urllib.parse
 
 import requests
+from requests.adapters import HTTPAdapter
 
+from .base import _SharedTokenAttribute
 from .base import BaseUploadPipeline
+from .base import inspect_requests_response
+
+
+class _ProgressReader:
+    """
+    Read-only file wrapper that serves the next size bytes of a file and
+    reports how far into the file it has read, so a streamed request body
+    can drive the progress bar.
+    """
+
+    def __init__(self, file, size, on_read, chunk_size, offset=0):
+        self._file = file
+        self._size = size
+        self._on_read = on_read
+        self._chunk_size = chunk_size
+        self._offset = offset
+        self._bytes_read = 0
+
+    def __len__(self):
+        return self._size
+
+    def read(self, size=-1):
+        remaining = self._size - self._bytes_read
+        if size is None or size < 0 or size > remaining:
+            size = remaining
+        chunk = self._file.read(size)
+        self._bytes_read += len(chunk)
+        self._on_read(self._offset + self._bytes_read)
+        return chunk
+
+    def __iter__(self):
+        while chunk := self.read(self._chunk_size):
+            yield chunk
 
 
 class TikTokUploadPipeline(BaseUploadPipeline):
@@ -19,13 +58,35 @@ class TikTokUploadPipeline(BaseUploadPipeline):
     TIKTOK_AUTH_BASE_URL = "https://www.tiktok.com"
     TIKTOK_API_BASE_URL = "https://open.tiktokapis.com"
     TIKTOK_TOKEN_URL = "https://open.tiktokapis.com/v2/oauth/token/"
+    TIKTOK_PUBLISH_INIT_URL = "https://open.tiktokapis.com/v2/post/publish/video/init/"
 
-    # Video processing constants
-    DEFAULT_PROCESSING_TIME_PER_MB = 10  # seconds
-    MIN_PROCESSING_TIME = 15  # seconds
-    MAX_PROGRESS_DURING_PROCESSING = 80  # don't complete progress bar during processing
-    API_POLL_INTERVAL = 3  # seconds between status checks
-    MIN_PROGRESS_INCREMENT = 2.0
+    # Video upload constants
+    UPLOAD_READ_SIZE = 1024 * 1024  # bytes read from disk per socket write batch
+    UPLOAD_CHUNK_SIZE = 10 * 1024 * 1024  # bytes per PUT; TikTok allows 5-64 MB
+    UPLOAD_PROGRESS_STEP = 0.5  # percent of progress between bar redraws
+
+    # Video file constants
+    MAX_VIDEO_SIZE = 500 * 1024 * 1024  # 500MB practical limit for TikTok
+    SUPPORTED_VIDEO_EXTENSIONS = ('.mp4', '.mov', '.avi', '.webm', '.mkv')
+
+    # Token cache constants
+    TOKEN_REFRESH_MARGIN = 300  # seconds before expiry a cached token is refreshed
+    DEFAULT_TOKEN_LIFETIME = 86400  # seconds assumed when expires_in is missing
+
+    # HTTP connection pool constants
+    HTTP_POOL_CONNECTIONS = 4  # number of hosts to keep pools for
+    HTTP_POOL_MAXSIZE = 8  # connections kept alive per host
+
+    # HTTP session shared by all instances, created on first use
+    _shared_session = None
+    _shared_session_lock = threading.Lock()
+
+    # Tokens and their refresh lock, shared by every instance for the same
+    # client so a rotated refresh token is never used twice
+    access_token = _SharedTokenAttribute()
+    access_token_expires_at = _SharedTokenAttribute()
+    refresh_token = _SharedTokenAttribute()
+    _refresh_lock = _SharedTokenAttribute()
 
     def __init__(self,
                  tiktok_client_key=os.getenv("TIKTOK_CLIENT_KEY"),
@@ -34,7 +95,10 @@ class TikTokUploadPipeline(BaseUploadPipeline):
                  redirect_uri="http://127.0.0.1:80/callback/",
                  scope="user.info.basic,video.upload,video.publish",
                  request_timeout=30,
-                 upload_timeout=300):
+                 upload_timeout=300,
+                 token_cache_path=os.path.join("~", ".clipmorph",
+                                               "tiktok_tokens.json"),
+                 session=None):
         """Initialize the TikTok upload pipeline.
         
         Args:
@@ -52,22 +116,51 @@ class TikTokUploadPipeline(BaseUploadPipeline):
                 Defaults to 30 seconds.
             upload_timeout (int, optional): Timeout for video upload in seconds.
                 Defaults to 300 seconds.
+            token_cache_path (str, optional): File used to persist the access token
+                and refresh token between runs. None disables it.
+                Defaults to '~/.clipmorph/tiktok_tokens.json'.
+            session (requests.Session, optional): HTTP session to use instead of
+                the one shared by all TikTok pipelines. The caller closes it.
         """
         # TikTok credentials
         self.client_key = tiktok_client_key
         self.client_secret = tiktok_client_secret
-        self.refresh_token = tiktok_refresh_token
 
         # Authentication configuration
         self.redirect_uri = redirect_uri
         self.scope = scope
+        self._oauth_state = secrets.token_urlsafe(16)
+        self._static_auth_params = urllib.parse.urlencode({
+            "client_key": self.client_key,
+            "response_type": "code",
+            "scope": self.scope,
+            "redirect_uri": self.redirect_uri,
+            "state": self._oauth_state,
+            "code_challenge_method": "S256"
+        })
 
         # Timeout configuration
         self.request_timeout = request_timeout
         self.upload_timeout = upload_timeout
 
+        # Token cache configuration
+        self.token_cache_path = os.path.expanduser(
+            token_cache_path) if token_cache_path else None
+
         # Runtime state
-        self.access_token = None
+        self._share_token_state(self.client_key,
+                                access_token=None,
+                                access_token_expires_at=None,
+                                refresh_token=tiktok_refresh_token,
+                                _refresh_lock=threading.Lock())
+        self._api_headers_token = None
+        self._api_headers_cache = None
+
+        # Shared HTTP session so TikTok API calls reuse keep-alive connections
+        # across calls and across pipeline instances
+        if session is None:
+            session = self._get_shared_session()
+        self.session = session
 
         # Progress bar configuration
         self.progress_allocations = {
@@ -78,6 +171,9 @@ class TikTokUploadPipeline(BaseUploadPipeline):
         }
         self.progress_bar = None
 
+        # Response inspector for retried calls (requests library)
+        self._response_inspector = inspect_requests_response
+
         # Set platform name for base class
         self.platform_name = "TikTok"
 
@@ -97,36 +193,48 @@ class TikTokUploadPipeline(BaseUploadPipeline):
     def _enhance_error_message(self, response):
         """TikTok-specific error message enhancement."""
         try:
-            error_data = response.json()
+            error_data = self._error_json(response)
+            if not error_data:
+                return
             api_error = error_data.get('error', {}).get('message', '')
             if api_error:
                 response.reason = f"{response.reason}: {api_error}"
         except:
             pass
 
+    @classmethod
+    def _get_shared_session(cls):
+        """
+        Return the HTTP session shared by all TikTok pipelines, creating it
+        on first use. It is closed when the interpreter exits.
+        """
+        with cls._shared_session_lock:
+            if TikTokUploadPipeline._shared_session is None:
+                session = requests.Session()
+                session.mount(
+                    "https://",
+                    HTTPAdapter(pool_connections=cls.HTTP_POOL_CONNECTIONS,
+                                pool_maxsize=cls.HTTP_POOL_MAXSIZE))
+                atexit.register(session.close)
+                TikTokUploadPipeline._shared_session = session
+            return TikTokUploadPipeline._shared_session
+
     def _generate_code_verifier(self, length=64):
-        """Generate a PKCE code verifier."""
-        chars = 'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-._~'
-        return ''.join(secrets.choice(chars) for _ in range(length))
+        """Generate a PKCE code verifier of URL-safe characters."""
+        # token_urlsafe yields ~4 characters per 3 bytes; trim to length
+        return secrets.token_urlsafe(length)[:length]
 
     def _generate_code_challenge(self, code_verifier):
-        """Generate a PKCE code challenge from code verifier."""
-        sha256 = hashlib.sha256(code_verifier.encode('utf-8')).digest()
-        return sha256.hex()
+        """
+        Generate a PKCE code challenge from code verifier. TikTok's desktop
+        flow expects the hex-encoded SHA-256 digest, not RFC 7636 base64url.
+        """
+        return hashlib.sha256(code_verifier.encode('ascii')).hexdigest()
 
     def _generate_auth_url(self, code_challenge):
         """Generate TikTok OAuth authorization URL."""
-        params = {
-            "client_key": self.client_key,
-            "response_type": "code",
-            "scope": self.scope,
-            "redirect_uri": self.redirect_uri,
-            "state": "random_state_string",
-            "code_challenge": code_challenge,
-            "code_challenge_method": "S256"
-        }
-        return f"{self.TIKTOK_AUTH_BASE_URL}/v2/auth/authorize/?" + urllib.parse.urlencode(
-            params)
+        return (f"{self.TIKTOK_AUTH_BASE_URL}/v2/auth/authorize/?"
+                f"{self._static_auth_params}&code_challenge={code_challenge}")
 
     def _exchange_code_for_token(self, auth_code, code_verifier):
         """Exchange authorization code for access token."""
@@ -139,7 +247,7 @@ class TikTokUploadPipeline(BaseUploadPipeline):
             "code_verifier": code_verifier,
         }
         headers = {"Content-Type": "application/x-www-form-urlencoded"}
-        response = self._retry_request(requests.post,
+        response = self._retry_request(self.session.post,
                                        self.TIKTOK_TOKEN_URL,
                                        data=data,
                                        headers=headers,
@@ -169,7 +277,7 @@ class TikTokUploadPipeline(BaseUploadPipeline):
             'refresh_token': self.refresh_token
         }
         headers = {'Content-Type': 'application/x-www-form-urlencoded'}
-        response = self._retry_request(requests.post,
+        response = self._retry_request(self.session.post,
                                        self.TIKTOK_TOKEN_URL,
                                        data=data,
                                        headers=headers,
@@ -181,31 +289,93 @@ class TikTokUploadPipeline(BaseUploadPipeline):
         if not self.access_token:
             raise RuntimeError("Failed to refresh access token")
 
+        self.access_token_expires_at = time.time() + resp_json.get(
+            'expires_in', self.DEFAULT_TOKEN_LIFETIME)
+        # TikTok may rotate the refresh token; keep the newest one
+        self.refresh_token = resp_json.get('refresh_token', self.refresh_token)
+        self._save_cached_tokens()
+
         self._update_progress("authenticate", "Authenticated with TikTok")
         return self.access_token
 
+    def _authenticate(self):
+        """
+        Uses the in-memory or cached access token while it is comfortably
+        valid, and refreshes it otherwise. Runs under the refresh lock shared
+        with other instances, so only one of them refreshes and the rest use
+        its token.
+        """
+        with self._refresh_lock:
+            if not self.access_token:
+                self._load_cached_tokens()
+
+            if (self.access_token and self.access_token_expires_at
+                    and self.access_token_expires_at - time.time() >
+                    self.TOKEN_REFRESH_MARGIN):
+                self._update_progress("authenticate",
+                                      "Authenticated with TikTok")
+                return self.access_token
+            return self._refresh_access_token()
+
+    def _token_cache_key(self):
+        """Returns the cache key for this client without storing the raw key."""
+        return hashlib.sha256(self.client_key.encode('utf-8')).hexdigest()
+
+    def _load_cached_tokens(self):
+        """
+        Fills in the access token and, if none was provided, the refresh
+        token from the token cache. Expired access tokens are skipped.
+        """
+        cache = self._read_json_cache(self.token_cache_path, "token cache")
+        entry = cache.get(self._token_cache_key())
+        if not entry:
+            return
+
+        expires_at = entry.get('access_token_expires_at')
+        if entry.get('access_token') and expires_at and expires_at > time.time():
+            self.access_token = entry['access_token']
+            self.access_token_expires_at = expires_at
+
+        self.refresh_token = self.refresh_token or entry.get('refresh_token')
+
+    def _save_cached_tokens(self):
+        """Writes the current tokens to the token cache (mode 0600)."""
+        if not self.token_cache_path:
+            return
+
+        cache = self._read_json_cache(self.token_cache_path, "token cache")
+        cache[self._token_cache_key()] = {
+            'access_token': self.access_token,
+            'access_token_expires_at': self.access_token_expires_at,
+            'refresh_token': self.refresh_token,
+        }
+        self._write_json_cache_atomic(self.token_cache_path, cache,
+                                      "token cache")
+
     def _validate_video_file(self, video_path: str):
         """
         Validates the video file before upload.
         """
-        if not os.path.exists(video_path):
-            raise FileNotFoundError(f"Video file not found: {video_path}")
+        # A single stat both checks existence and gets the size
+        try:
+            file_size = os.stat(video_path).st_size
+        except FileNotFoundError:
+            raise FileNotFoundError(
+                f"Video file not found: {video_path}") from None
 
         # Check file size (TikTok has specific limits)
-        file_size = os.path.getsize(video_path)
-        max_size = 500 * 1024 * 1024  # 500MB practical limit for TikTok
+        max_size = self.MAX_VIDEO_SIZE
         if file_size > max_size:
             raise ValueError(
                 f"Video file too large: {file_size / (1024**2):.1f}MB. "
                 f"Maximum recommended size: {max_size / (1024**2):.1f}MB")
 
         # Check file extension
-        valid_extensions = ['.mp4', '.mov', '.avi', '.webm', '.mkv']
         file_ext = os.path.splitext(video_path)[1].lower()
-        if file_ext not in valid_extensions:
+        if file_ext not in self.SUPPORTED_VIDEO_EXTENSIONS:
             raise ValueError(
                 f"Unsupported video format: {file_ext}. "
-                f"Supported formats: {', '.join(valid_extensions)}")
+                f"Supported formats: {', '.join(self.SUPPORTED_VIDEO_EXTENSIONS)}")
 
         self._update_progress("validate_file", "Video file validated")
         return file_size
@@ -217,11 +387,7 @@ class TikTokUploadPipeline(BaseUploadPipeline):
         """
         Initialize the upload and retrieve upload URL.
         """
-        publish_endpoint = f'{self.TIKTOK_API_BASE_URL}/v2/post/publish/video/init/'
-        headers = {
-            'Authorization': f'Bearer {self.access_token}',
-            'Content-Type': 'application/json; charset=UTF-8'
-        }
+        chunk_size, total_chunk_count = self._chunk_layout(video_size)
         post_data = {
             'post_info': {
                 'privacy_level': privacy_level,
@@ -230,15 +396,17 @@ class TikTokUploadPipeline(BaseUploadPipeline):
             'source_info': {
                 'source': 'FILE_UPLOAD',
                 'video_size': video_size,
-                'chunk_size': video_size,
-                'total_chunk_count': 1
+                'chunk_size': chunk_size,
+                'total_chunk_count': total_chunk_count
             }
         }
+        # Encode once here rather than on every retry attempt
+        body = json.dumps(post_data, allow_nan=False).encode('utf-8')
 
-        response = self._retry_request(requests.post,
-                                       publish_endpoint,
-                                       json=post_data,
-                                       headers=headers,
+        response = self._retry_request(self.session.post,
+                                       self.TIKTOK_PUBLISH_INIT_URL,
+                                       data=body,
+                                       headers=self._api_headers(),
                                        timeout=self.request_timeout)
 
         data = response.json().get('data', {})
@@ -252,46 +420,92 @@ class TikTokUploadPipeline(BaseUploadPipeline):
         self._update_progress("initialize_upload", "Upload initialized")
         return upload_url, publish_id
 
+    def _api_headers(self):
+        """
+        Returns the headers for authenticated TikTok API calls, rebuilt only
+        when the access token changes. They are passed per request rather
+        than set on the session so the bearer token never reaches the token
+        endpoint or the upload URL.
+        """
+        if self._api_headers_token != self.access_token:
+            self._api_headers_cache = {
+                'Authorization': f'Bearer {self.access_token}',
+                'Content-Type': 'application/json; charset=UTF-8'
+            }
+            self._api_headers_token = self.access_token
+        return self._api_headers_cache
+
+    def _chunk_layout(self, video_size: int):
+        """
+        Splits an upload into chunks the way TikTok expects: videos smaller
+        than one chunk go up whole, otherwise every chunk is
+        UPLOAD_CHUNK_SIZE and the last one also carries the remainder.
+
+        Returns:
+            tuple: (chunk_size, total_chunk_count)
+        """
+        if video_size < self.UPLOAD_CHUNK_SIZE:
+            return video_size, 1
+        return self.UPLOAD_CHUNK_SIZE, video_size // self.UPLOAD_CHUNK_SIZE
+
     def _upload_video_file(self, video_path: str, upload_url: str,
                            video_size: int):
         """
         Upload the video file to TikTok servers with progress tracking.
+        Each chunk is streamed from disk in its own PUT, so a failure only
+        retries that chunk, and the progress bar follows the bytes sent.
         """
         start_time = time.time()
-        current_progress = self.progress_bar.n if self.progress_bar else 0
-
-        # Calculate increment per update based on file size
-        video_size_mb = video_size / (1024 * 1024)
-        estimated_time = max(
-            self.MIN_PROCESSING_TIME,
-            video_size_mb * self.DEFAULT_PROCESSING_TIME_PER_MB)
-        increment_per_update = max(
-            self.MIN_PROGRESS_INCREMENT, self.MAX_PROGRESS_DURING_PROCESSING /
-            (estimated_time / self.API_POLL_INTERVAL))
-
-        with open(video_path, 'rb') as f:
-            video_data = f.read()
-            headers = {
-                'Content-Type': 'video/mp4',
-                'Content-Length': str(video_size),
-                'Content-Range': f'bytes 0-{video_size-1}/{video_size}'
-            }
-
-            # Update description during upload
-            if self.progress_bar:
+        allocation = self.progress_allocations["video_upload"]
+        # Progress already shown, kept across retries so it never goes back
+        shown = 0.0
+
+        def on_read(bytes_read):
+            nonlocal shown
+            target = allocation * bytes_read / max(video_size, 1)
+            if self.progress_bar and target - shown >= self.UPLOAD_PROGRESS_STEP:
                 elapsed = time.time() - start_time
                 self.progress_bar.set_description(
-                    f"[TikTok] Uploading video... ({elapsed:.0f}s)")
-
-            response = self._retry_request(requests.put,
-                                           upload_url,
-                                           data=video_data,
-                                           headers=headers,
-                                           timeout=self.upload_timeout)
+                    f"[TikTok] Uploading video... ({elapsed:.0f}s)",
+                    refresh=False)
+                self.progress_bar.update(target - shown)
+                shown = target
 
-            self._update_progress("video_upload",
-                                  "Video uploaded successfully")
-            return True
+        def put_chunk(start, length):
+            # Reopen on every attempt so a retry resends the whole chunk
+            headers = {
+                'Content-Type': 'video/mp4',
+                'Content-Length': str(length),
+                'Content-Range':
+                f'bytes {start}-{start + length - 1}/{video_size}'
+            }
+            with open(video_path, 'rb',
+                      buffering=self.UPLOAD_READ_SIZE) as f:
+                f.seek(start)
+                return self.session.put(upload_url,
+                                        data=_ProgressReader(
+                                            f, length, on_read,
+                                            self.UPLOAD_READ_SIZE, start),
+                                        headers=headers,
+                                        timeout=self.upload_timeout)
+
+        chunk_size, total_chunk_count = self._chunk_layout(video_size)
+        for index in range(total_chunk_count):
+            start = index * chunk_size
+            # The last chunk also carries the remainder
+            length = (video_size - start if index == total_chunk_count - 1
+                      else chunk_size)
+            self._retry_request(put_chunk, start, length)
+
+        # Top up whatever the byte count didn't cover and report the step
+        if self.progress_bar and allocation > shown:
+            self.progress_bar.update(allocation - shown)
+        if self.progress_callback:
+            self.progress_callback("video_upload", allocation)
+        if self.progress_bar:
+            self.progress_bar.set_description(
+                "[TikTok] Video uploaded successfully")
+        return True
 
     def generate_refresh_token(self):
         """
@@ -322,6 +536,9 @@ class TikTokUploadPipeline(BaseUploadPipeline):
 
         if not auth_code:
             raise ValueError("Authorization code not found in the URL")
+        if query.get("state", [None])[0] != self._oauth_state:
+            raise ValueError(
+                "OAuth state in the redirect URL does not match this request")
 
         # Step 3: Exchange code for access token and refresh token
         token_response = self._exchange_code_for_token(auth_code,
@@ -363,18 +580,18 @@ class TikTokUploadPipeline(BaseUploadPipeline):
                 f"Invalid privacy level: {privacy_level}. "
                 f"Must be one of: {', '.join(valid_privacy_levels)}")
 
-        total_progress = sum(self.progress_allocations.values())
+        total_progress = self._total_progress
         publish_id = None
 
         with self._progress_context(total_progress, "Starting upload"):
             try:
-                # Authenticate with TikTok
-                if not self.access_token:
-                    self._refresh_access_token()
-
-                # Validate video file
+                # Validate the video file first; it's a single stat, and a
+                # bad path then fails before any token refresh starts
                 file_size = self._validate_video_file(video_path)
 
+                # Authenticate with TikTok
+                self._authenticate()
+
                 # Initialize upload
                 upload_url, publish_id = self._initialize_upload(
                     file_size, title, privacy_level)
@@ -1,11 +1,17 @@
+from concurrent.futures import as_completed
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import json
 import logging
+import mimetypes
 import os
 import time
 
+from requests.adapters import HTTPAdapter
 from requests_oauthlib import OAuth1Session
-import tweepy
 
 from .base import BaseUploadPipeline
+from .base import inspect_requests_response
 
 
 class TwitterUploadPipeline(BaseUploadPipeline):
@@ -17,14 +23,33 @@ class TwitterUploadPipeline(BaseUploadPipeline):
     # Constants
     TWITTER_API_BASE_URL = "https://api.twitter.com"
     TWITTER_UPLOAD_BASE_URL = "https://upload.twitter.com"
+    TWITTER_MEDIA_UPLOAD_URL = "https://upload.twitter.com/1.1/media/upload.json"
+    TWITTER_TWEETS_URL = "https://api.twitter.com/2/tweets"
+
+    # Chunked media upload constants
+    MEDIA_SEGMENT_SIZE = 4 * 1024 * 1024  # bytes per APPEND; Twitter allows up to 5MB
+    MEDIA_UPLOAD_WORKERS = 4  # APPEND requests sent concurrently
+
+    # HTTP connection pool constants
+    HTTP_POOL_CONNECTIONS = 4  # number of hosts to keep pools for
+    HTTP_POOL_MAXSIZE = 8  # connections kept alive per host; >= MEDIA_UPLOAD_WORKERS
 
     # Video processing constants
     DEFAULT_PROCESSING_TIME_PER_MB = 8  # seconds
     MIN_PROCESSING_TIME = 10  # seconds
     MAX_PROGRESS_DURING_PROCESSING = 80  # don't complete progress bar during processing
-    API_POLL_INTERVAL = 5  # seconds between status checks
+    API_POLL_INTERVAL = 5  # seconds between status checks, used for progress estimates
+    MIN_POLL_INTERVAL = 1  # seconds before the first status re-check
+    MAX_POLL_INTERVAL = 15  # seconds; cap for the doubling poll interval
     MIN_PROGRESS_INCREMENT = 2.0
 
+    # Video file constants
+    MAX_VIDEO_SIZE = 512 * 1024 * 1024  # 512MB limit for Twitter
+    SUPPORTED_VIDEO_EXTENSIONS = ('.mp4', '.mov', '.avi', '.webm', '.mkv')
+
+    # Media cache constants
+    MEDIA_CACHE_TTL = 23 * 3600  # seconds; Twitter media IDs expire after ~24h
+
     def __init__(self,
                  twitter_api_key=os.getenv("TWITTER_API_KEY"),
                  twitter_api_key_secret=os.getenv("TWITTER_API_KEY_SECRET"),
@@ -34,7 +59,9 @@ class TwitterUploadPipeline(BaseUploadPipeline):
                  twitter_bearer_token=os.getenv("TWITTER_BEARER_TOKEN"),
                  request_timeout=30,
                  processing_timeout=300,
-                 max_processing_retries=30):
+                 max_processing_retries=30,
+                 media_cache_path=os.path.join("~", ".clipmorph",
+                                               "twitter_media.json")):
         """Initialize the Twitter upload pipeline.
         
         Args:
@@ -46,32 +73,44 @@ class TwitterUploadPipeline(BaseUploadPipeline):
                 Defaults to TWITTER_ACCESS_TOKEN environment variable.
             twitter_access_token_secret (str, optional): Twitter Access Token Secret for API access.
                 Defaults to TWITTER_ACCESS_TOKEN_SECRET environment variable.
-            twitter_bearer_token (str, optional): Twitter Bearer Token for API access.
-                Defaults to TWITTER_BEARER_TOKEN environment variable.
+            twitter_bearer_token (str, optional): Deprecated and unused; uploads
+                authenticate with OAuth 1.0a user credentials only. Accepted so
+                existing callers keep working.
             request_timeout (int, optional): Timeout for HTTP requests in seconds.
                 Defaults to 30 seconds.
             processing_timeout (int, optional): Timeout for video processing in seconds.
                 Defaults to 300 seconds.
-            max_processing_retries (int, optional): Maximum retries for processing status checks.
+            max_processing_retries (int, optional): Maximum consecutive failed processing
+                status checks before giving up.
                 Defaults to 30 retries.
+            media_cache_path (str, optional): File remembering uploaded media IDs so
+                re-running an upload of the same file skips the media upload.
+                None disables it. Defaults to '~/.clipmorph/twitter_media.json'.
         """
         # Twitter credentials
         self.api_key = twitter_api_key
         self.api_key_secret = twitter_api_key_secret
         self.access_token = twitter_access_token
         self.access_token_secret = twitter_access_token_secret
-        self.bearer_token = twitter_bearer_token
+        self.bearer_token = twitter_bearer_token  # deprecated, unused
 
         # Configuration
         self.request_timeout = request_timeout
         self.processing_timeout = processing_timeout
         self.max_processing_retries = max_processing_retries
 
+        # Media cache configuration
+        self.media_cache_path = os.path.expanduser(
+            media_cache_path) if media_cache_path else None
+
         # Runtime state
-        self.api = None
-        self.client = None
         self.oauth_session = None
 
+        # Worker threads for sending media segments concurrently
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.MEDIA_UPLOAD_WORKERS,
+            thread_name_prefix="clipmorph-twitter")
+
         # Progress bar configuration
         self.progress_allocations = {
             "authenticate": 5,  # 5%
@@ -82,6 +121,9 @@ class TwitterUploadPipeline(BaseUploadPipeline):
         }
         self.progress_bar = None
 
+        # Response inspector for retried calls (requests via the OAuth session)
+        self._response_inspector = inspect_requests_response
+
         # Set platform name for base class
         self.platform_name = "Twitter"
 
@@ -91,13 +133,13 @@ class TwitterUploadPipeline(BaseUploadPipeline):
         # Validate required credentials
         if not all([
                 self.api_key, self.api_key_secret, self.access_token,
-                self.access_token_secret, self.bearer_token
+                self.access_token_secret
         ]):
             raise ValueError(
                 "Missing required Twitter credentials. Provide them as parameters "
                 "or set them as environment variables: TWITTER_API_KEY, "
                 "TWITTER_API_KEY_SECRET, TWITTER_ACCESS_TOKEN, "
-                "TWITTER_ACCESS_TOKEN_SECRET, TWITTER_BEARER_TOKEN")
+                "TWITTER_ACCESS_TOKEN_SECRET")
 
         # Validate base class requirements
         self._validate_required_attributes()
@@ -105,7 +147,9 @@ class TwitterUploadPipeline(BaseUploadPipeline):
     def _enhance_error_message(self, response):
         """Twitter-specific error message enhancement."""
         try:
-            error_data = response.json()
+            error_data = self._error_json(response)
+            if not error_data:
+                return
             # Twitter uses 'errors' array format
             api_error = error_data.get('errors', [{}])[0].get('message', '')
             if api_error:
@@ -113,82 +157,214 @@ class TwitterUploadPipeline(BaseUploadPipeline):
         except:
             pass
 
+    def close(self):
+        """Shuts down the upload worker threads and the OAuth session."""
+        self._executor.shutdown(wait=True)
+        if self.oauth_session:
+            self.oauth_session.close()
+
     def _authenticate(self):
         """
         Authenticates with Twitter API using provided credentials.
-        Returns authenticated API and client objects.
+        Returns the OAuth session used for media uploads, status checks and
+        tweets.
         """
-        auth = tweepy.OAuth1UserHandler(self.api_key, self.api_key_secret,
-                                        self.access_token,
-                                        self.access_token_secret)
-        self.api = tweepy.API(auth)
-
-        self.client = tweepy.Client(
-            bearer_token=self.bearer_token,
-            consumer_key=self.api_key,
-            consumer_secret=self.api_key_secret,
-            access_token=self.access_token,
-            access_token_secret=self.access_token_secret)
-
-        # Create OAuth session for status checking
+        # Pooled so segment uploads, status polls and the tweet reuse
+        # keep-alive connections
+        if self.oauth_session:
+            self.oauth_session.close()
         self.oauth_session = OAuth1Session(
             self.api_key,
             client_secret=self.api_key_secret,
             resource_owner_key=self.access_token,
             resource_owner_secret=self.access_token_secret)
+        self.oauth_session.mount(
+            "https://",
+            HTTPAdapter(pool_connections=self.HTTP_POOL_CONNECTIONS,
+                        pool_maxsize=self.HTTP_POOL_MAXSIZE))
 
         self._update_progress("authenticate", "Authenticated with Twitter")
-        return self.api, self.client
+        return self.oauth_session
 
     def _validate_video_file(self, video_path: str):
         """
         Validates the video file before upload.
         """
-        if not os.path.exists(video_path):
-            raise FileNotFoundError(f"Video file not found: {video_path}")
+        # A single stat both checks existence and gets the size
+        try:
+            file_size = os.stat(video_path).st_size
+        except FileNotFoundError:
+            raise FileNotFoundError(
+                f"Video file not found: {video_path}") from None
 
         # Check file size (Twitter has a 512MB limit)
-        file_size = os.path.getsize(video_path)
-        max_size = 512 * 1024 * 1024  # 512MB limit for Twitter
+        max_size = self.MAX_VIDEO_SIZE
         if file_size > max_size:
             raise ValueError(
                 f"Video file too large: {file_size / (1024**2):.1f}MB. "
                 f"Maximum size: {max_size / (1024**2):.1f}MB")
 
         # Check file extension
-        valid_extensions = ['.mp4', '.mov', '.avi', '.webm', '.mkv']
         file_ext = os.path.splitext(video_path)[1].lower()
-        if file_ext not in valid_extensions:
+        if file_ext not in self.SUPPORTED_VIDEO_EXTENSIONS:
             raise ValueError(
                 f"Unsupported video format: {file_ext}. "
-                f"Supported formats: {', '.join(valid_extensions)}")
+                f"Supported formats: {', '.join(self.SUPPORTED_VIDEO_EXTENSIONS)}")
 
         self._update_progress("validate_file", "Video file validated")
         return file_size
 
-    def _upload_media(self, video_path: str):
+    def _media_cache_key(self, video_path: str):
         """
-        Upload video media to Twitter and return media ID.
+        Returns the media cache key for a video file. It changes when the
+        file is modified and is tied to the account the media belongs to.
         """
+        st = os.stat(video_path)
+        key = (f"{self.access_token}:{os.path.abspath(video_path)}:"
+               f"{st.st_size}:{st.st_mtime_ns}")
+        return hashlib.sha256(key.encode('utf-8')).hexdigest()
 
-        def upload_with_retry():
-            return self.api.media_upload(video_path,
-                                         media_category="tweet_video")
-
-        media = self._retry_request(upload_with_retry)
-        media_id = media.media_id_string
+    def _load_cached_media_id(self, cache_key: str):
+        """
+        Returns a previously uploaded media ID for this file if it is still
+        fresh and Twitter reports it ready, otherwise None.
+        """
+        cache = self._read_json_cache(self.media_cache_path, "media cache")
+        entry = cache.get(cache_key)
+        if (not entry or time.time() - entry.get('created_at', 0) >=
+                self.MEDIA_CACHE_TTL):
+            return None
 
-        self._update_progress("media_upload",
-                              f"Media uploaded (ID: {media_id})")
+        media_id = entry.get('media_id')
+        try:
+            response = self.oauth_session.get(
+                self.TWITTER_MEDIA_UPLOAD_URL,
+                params={'command': 'STATUS', 'media_id': media_id},
+                timeout=self.request_timeout)
+        except Exception as e:
+            logging.warning(f"Could not check cached Twitter media: {e}")
+            return None
+        if not response.ok:
+            return None
+
+        processing_info = response.json().get('processing_info')
+        if processing_info and processing_info.get('state') != 'succeeded':
+            return None
         return media_id
 
+    def _save_cached_media_id(self, cache_key: str, media_id: str):
+        """Records an uploaded media ID in the media cache, dropping expired entries."""
+        if not self.media_cache_path:
+            return
+
+        now = time.time()
+        cache = {
+            key: entry
+            for key, entry in self._read_json_cache(
+                self.media_cache_path, "media cache").items()
+            if now - entry.get('created_at', 0) < self.MEDIA_CACHE_TTL
+        }
+        cache[cache_key] = {'media_id': media_id, 'created_at': now}
+        self._write_json_cache_atomic(self.media_cache_path, cache,
+                                      "media cache")
+
+    def _media_upload_request(self, data, files=None):
+        """
+        POST a chunked media upload command (INIT, APPEND or FINALIZE)
+        with retries and return the response.
+        """
+        return self._retry_request(self.oauth_session.post,
+                                   self.TWITTER_MEDIA_UPLOAD_URL,
+                                   data=data,
+                                   files=files,
+                                   timeout=self.request_timeout)
+
+    def _upload_media(self, video_path: str, file_size: int):
+        """
+        Upload video media to Twitter with the chunked INIT/APPEND/FINALIZE
+        flow, sending segments concurrently.
+        
+        Returns:
+            Tuple of (media_id, processing_info); processing_info is None
+            when Twitter has no processing left to do
+        """
+        # Declare the file's real container; Twitter rejects a mismatch only
+        # after every segment has been sent
+        media_type = mimetypes.guess_type(video_path)[0] or "video/mp4"
+        init = self._media_upload_request({
+            'command': 'INIT',
+            'total_bytes': file_size,
+            'media_type': media_type,
+            'media_category': 'tweet_video'
+        }).json()
+        media_id = init['media_id_string']
+
+        def append_segment(segment_index, start, length):
+            # Read inside the retried call so every attempt sends the segment
+            def send():
+                with open(video_path, 'rb') as f:
+                    f.seek(start)
+                    segment = f.read(length)
+                return self.oauth_session.post(
+                    self.TWITTER_MEDIA_UPLOAD_URL,
+                    data={
+                        'command': 'APPEND',
+                        'media_id': media_id,
+                        'segment_index': segment_index
+                    },
+                    files={'media': segment},
+                    timeout=self.request_timeout)
+
+            self._retry_request(send)
+            return length
+
+        futures = [
+            self._executor.submit(append_segment, segment_index, start,
+                                  min(self.MEDIA_SEGMENT_SIZE,
+                                      file_size - start))
+            for segment_index, start in enumerate(
+                range(0, file_size, self.MEDIA_SEGMENT_SIZE))
+        ]
+
+        # Advance the bar per segment; the step is topped up once at the end
+        allocation = self.progress_allocations["media_upload"]
+        shown = 0.0
+        try:
+            for future in as_completed(futures):
+                length = future.result()
+                if self.progress_bar:
+                    increment = allocation * length / max(file_size, 1)
+                    self.progress_bar.update(increment)
+                    shown += increment
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
+
+        finalize = self._media_upload_request({
+            'command': 'FINALIZE',
+            'media_id': media_id
+        }).json()
+
+        if self.progress_bar and allocation > shown:
+            self.progress_bar.update(allocation - shown)
+        if self.progress_callback:
+            self.progress_callback("media_upload", allocation)
+        if self.progress_bar:
+            self.progress_bar.set_description(
+                f"[Twitter] Media uploaded (ID: {media_id})")
+        return media_id, finalize.get("processing_info")
+
     def _wait_for_processing(self, media_id: str, video_size_mb: float):
         """
         Wait for video processing to complete with progress tracking.
         """
         processing_state = None
-        retry_count = 0
-        start_time = time.time()
+        failed_checks = 0
+        start_time = time.monotonic()
+        # Poll quickly at first and back off, unless Twitter says when to check
+        poll_interval = self.MIN_POLL_INTERVAL
+        error_interval = self.MIN_POLL_INTERVAL
 
         # Calculate progress increment based on file size
         estimated_time = max(
@@ -199,27 +375,37 @@ class TwitterUploadPipeline(BaseUploadPipeline):
             (estimated_time / self.API_POLL_INTERVAL))
 
         current_progress = self.progress_bar.n if self.progress_bar else 0
+        shown_second = None
 
-        while (processing_state != "succeeded"
-               and retry_count < self.max_processing_retries
-               and time.time() - start_time < self.processing_timeout):
-
-            elapsed = time.time() - start_time
+        status_url = (f"{self.TWITTER_MEDIA_UPLOAD_URL}"
+                      f"?command=STATUS&media_id={media_id}")
 
-            # Update progress description with elapsed time
-            if self.progress_bar:
+        while (processing_state != "succeeded"
+               and failed_checks < self.max_processing_retries):
+            elapsed = time.monotonic() - start_time
+            if elapsed >= self.processing_timeout:
+                break
+
+            # Update progress description with elapsed time, redrawing only
+            # when the displayed second changes
+            if self.progress_bar and int(elapsed) != shown_second:
+                shown_second = int(elapsed)
                 self.progress_bar.set_description(
-                    f"[Twitter Processing video... ({elapsed:.0f}s)")
-
-            status_url = f"{self.TWITTER_UPLOAD_BASE_URL}/1.1/media/upload.json?command=STATUS&media_id={media_id}"
-
-            def get_status():
-                return self.oauth_session.get(status_url)
+                    f"[Twitter] Processing video... ({shown_second}s)")
 
+            # Polled without _retry_request: a failed check is simply retried
+            # by this loop with its own backoff
             try:
-                response = self._retry_request(get_status)
+                response = self.oauth_session.get(status_url,
+                                                  timeout=self.request_timeout)
+                if response.status_code in self.RETRIABLE_STATUS_CODES:
+                    self._record_request_outcome(False)
+                response.raise_for_status()
+                self._record_request_outcome(True)
                 media_status = response.json()
                 processing_info = media_status.get("processing_info")
+                error_interval = self.MIN_POLL_INTERVAL
+                failed_checks = 0
 
                 if processing_info and processing_info.get("state"):
                     processing_state = processing_info["state"]
@@ -252,39 +438,61 @@ class TwitterUploadPipeline(BaseUploadPipeline):
                                 self.progress_bar.update(increment)
 
                         check_after_secs = processing_info.get(
-                            "check_after_secs", self.API_POLL_INTERVAL)
-                        time.sleep(check_after_secs)
-                        retry_count += 1
+                            "check_after_secs")
+                        if check_after_secs:
+                            time.sleep(check_after_secs)
+                        else:
+                            time.sleep(poll_interval)
+                            poll_interval = min(poll_interval * 2,
+                                                self.MAX_POLL_INTERVAL)
                 else:
                     # No processing info available yet
-                    time.sleep(self.API_POLL_INTERVAL)
-                    retry_count += 1
+                    time.sleep(poll_interval)
+                    poll_interval = min(poll_interval * 2,
+                                        self.MAX_POLL_INTERVAL)
 
             except Exception as e:
+                if isinstance(e, RuntimeError):
+                    raise
                 logging.warning(f"Error checking processing status: {e}")
-                time.sleep(self.API_POLL_INTERVAL)
-                retry_count += 1
+                retry_after = self._retry_after_seconds(
+                    getattr(e, 'response', None))
+                time.sleep(max(error_interval, retry_after or 0))
+                error_interval = min(error_interval * 2,
+                                     self.MAX_POLL_INTERVAL)
+                failed_checks += 1
 
         if processing_state != "succeeded":
-            if time.time() - start_time >= self.processing_timeout:
+            if time.monotonic() - start_time >= self.processing_timeout:
                 raise TimeoutError("Video processing timed out")
             else:
                 raise RuntimeError(
-                    "Video processing failed or exceeded retry limit")
+                    "Video processing status checks failed repeatedly")
 
         self._update_progress("video_processing", "Video processing completed")
         return True
 
     def _create_tweet(self, text: str, media_id: str):
         """
-        Create a tweet with the uploaded video.
+        Create a tweet with the uploaded video. Posts to the v2 endpoint
+        through the pooled OAuth session, so it reuses the connections kept
+        alive by the upload.
         """
-
-        def create_with_retry():
-            return self.client.create_tweet(text=text, media_ids=[media_id])
-
-        response = self._retry_request(create_with_retry)
-        tweet_id = response.data['id']
+        # Encode once here rather than on every retry attempt
+        body = json.dumps({
+            'text': text,
+            'media': {
+                'media_ids': [media_id]
+            }
+        }).encode('utf-8')
+
+        response = self._retry_request(
+            self.oauth_session.post,
+            self.TWITTER_TWEETS_URL,
+            data=body,
+            headers={'Content-Type': 'application/json'},
+            timeout=self.request_timeout)
+        tweet_id = response.json()['data']['id']
 
         self._update_progress("create_tweet", "Tweet created successfully")
         return tweet_id
@@ -300,24 +508,39 @@ class TwitterUploadPipeline(BaseUploadPipeline):
         Returns:
             str: Tweet ID of the posted tweet
         """
-        total_progress = sum(self.progress_allocations.values())
+        total_progress = self._total_progress
         tweet_id = None
 
         with self._progress_context(total_progress, "Starting upload"):
             try:
-                # Authenticate with Twitter
-                if not self.api or not self.client:
-                    self._authenticate()
-
-                # Validate video file
+                # Validate the video file first; it's a single stat, and a
+                # bad path then fails before authentication starts
                 file_size = self._validate_video_file(video_path)
                 video_size_mb = file_size / (1024 * 1024)
 
-                # Upload media
-                media_id = self._upload_media(video_path)
+                # Authenticate with Twitter
+                if not self.oauth_session:
+                    self._authenticate()
+
+                # Reuse media already uploaded from this file, if still valid
+                media_cache_key = self._media_cache_key(video_path)
+                media_id = self._load_cached_media_id(media_cache_key)
+                if media_id:
+                    self._update_progress(
+                        "media_upload", f"Reusing uploaded media (ID: {media_id})")
+                    self._update_progress("video_processing", "Video ready")
+                else:
+                    # Upload media
+                    media_id, processing_info = self._upload_media(
+                        video_path, file_size)
 
-                # Wait for processing to complete
-                self._wait_for_processing(media_id, video_size_mb)
+                    # Wait for processing to complete
+                    if processing_info:
+                        self._wait_for_processing(media_id, video_size_mb)
+                    else:
+                        self._update_progress("video_processing",
+                                              "Video ready")
+                    self._save_cached_media_id(media_cache_key, media_id)
 
                 # Create tweet with media
                 tweet_id = self._create_tweet(tweet_text, media_id)
@@ -37,6 +37,10 @@ class YouTubeUploadPipeline(BaseUploadPipeline):
     API_POLL_INTERVAL = 2  # seconds between status checks
     MIN_PROGRESS_INCREMENT = 2.0
 
+    # Resumable upload retries; 429 stays out, as it means quota exhaustion
+    # that retrying within the upload won't fix
+    RESUMABLE_RETRIABLE_STATUS_CODES = [500, 502, 503, 504]
+
     def __init__(self,
                  google_client_id=os.getenv("GOOGLE_CLIENT_ID"),
                  google_client_secret=os.getenv("GOOGLE_CLIENT_SECRET"),
@@ -295,7 +299,7 @@ class YouTubeUploadPipeline(BaseUploadPipeline):
                         )
 
             except HttpError as e:
-                if e.resp.status in self.RETRIABLE_STATUS_CODES:
+                if e.resp.status in self.RESUMABLE_RETRIABLE_STATUS_CODES:
                     error = f"Retriable HTTP error {e.resp.status}: {e.content}"
                 else:
                     raise e
@@ -387,7 +391,7 @@ class YouTubeUploadPipeline(BaseUploadPipeline):
             raise ValueError(f"Invalid privacy status: {privacy_status}. "
                              f"Must be one of: {', '.join(valid_privacy)}")
 
-        total_progress = sum(self.progress_allocations.values())
+        total_progress = self._total_progress
         video_id = None
 
         with self._progress_context(total_progress, "Starting upload"):
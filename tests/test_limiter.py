@@ -0,0 +1,27 @@
+import unittest
+
+from clipmorph.upload_pipeline.limiter import AdaptiveLimiter
+
+
+class AdaptiveLimiterTest(unittest.TestCase):
+
+    def test_grows_to_max_limit_and_halves_on_failure(self):
+        limiter = AdaptiveLimiter(initial=1, max_limit=4, success_threshold=2)
+
+        for _ in range(10):
+            limiter.on_success()
+        self.assertEqual(limiter.limit, 4)
+
+        limiter.on_failure()
+        self.assertEqual(limiter.limit, 2)
+        limiter.on_failure()
+        limiter.on_failure()
+        self.assertEqual(limiter.limit, 1)
+
+        limiter.on_success()
+        limiter.on_success()
+        self.assertEqual(limiter.limit, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,198 @@
+import random
+import threading
+import time
+import unittest
+
+from clipmorph.upload_pipeline import TikTokUploadPipeline
+from clipmorph.upload_pipeline import UploadPipeline
+
+
+def baseline_smart_truncate_content(title, description, tags, max_chars):
+    """Reference copy of the original _smart_truncate_content."""
+    hashtags = ''
+    if tags:
+        hashtags = ' '.join([
+            f"#{tag.strip('#').replace(' ', '')}" for tag in tags
+            if tag.strip()
+        ])
+
+    if len(title) >= max_chars:
+        return title[:max_chars].strip()
+
+    title_tags = f"{title}\n\n{hashtags}".strip() if hashtags else title
+    if len(title_tags) <= max_chars:
+        if description:
+            full_content = f"{title}\n\n{description}\n\n{hashtags}".strip(
+            ) if hashtags else f"{title}\n\n{description}".strip()
+            if len(full_content) <= max_chars:
+                return full_content
+            else:
+                available_for_desc = max_chars - len(title_tags) - 4
+                if available_for_desc > 10:
+                    truncated_desc = description[:available_for_desc].strip()
+                    return f"{title}\n\n{truncated_desc}\n\n{hashtags}".strip(
+                    ) if hashtags else f"{title}\n\n{truncated_desc}".strip()
+        return title_tags
+    else:
+        available_for_tags = max_chars - len(title) - 4
+        if available_for_tags > 5:
+            truncated_hashtags = hashtags[:available_for_tags].strip()
+            return f"{title}\n\n{truncated_hashtags}".strip()
+        else:
+            return title
+
+
+class SmartTruncateContentTest(unittest.TestCase):
+
+    def setUp(self):
+        # The method doesn't use instance state, so skip platform setup
+        self.pipeline = UploadPipeline.__new__(UploadPipeline)
+
+    def assert_matches_baseline(self, title, description, tags, max_chars):
+        self.assertEqual(
+            self.pipeline._smart_truncate_content(title, description, tags,
+                                                  max_chars),
+            baseline_smart_truncate_content(title, description, tags,
+                                            max_chars),
+            repr((title, description, tags, max_chars)))
+
+    def test_empty_and_padded_titles(self):
+        cases = [
+            ('', 'bb', ['t a g'] * 3, 14),
+            ('', 'hello world ' * 3, ['longtaglongtaglongtag'], 37),
+            ('', '', ['tag'], 10),
+            ('', 'description only', [], 20),
+            ('  padded  ', 'desc  ', ['tag'], 30),
+            ('  padded  ', '  desc', [], 12),
+            ('\n title', ' ' * 20, ['a', 'b'], 25),
+            ('title ', 'x' * 50, ['tag\n'], 40),
+            ('   ', 'desc', ['#tag'], 8),
+        ]
+        for case in cases:
+            self.assert_matches_baseline(*case)
+
+    def test_random_inputs_match_baseline(self):
+        rng = random.Random(0)
+        words = ['', ' ', 'a', 'hello', 'world ', ' pad', '\n', 'x' * 15]
+        for _ in range(5000):
+            title = ''.join(rng.choice(words) for _ in range(rng.randint(0, 3)))
+            description = ''.join(
+                rng.choice(words) for _ in range(rng.randint(0, 6)))
+            tags = [
+                rng.choice(['tag', 't a g', '#hash', ' ', 'longtag' * 3])
+                for _ in range(rng.randint(0, 4))
+            ]
+            self.assert_matches_baseline(title, description, tags,
+                                         rng.randint(1, 60))
+
+
+class FakePlatformPipeline:
+    """Stand-in pipeline that keeps per-upload state on the instance."""
+
+    started = None
+
+    def __init__(self):
+        self.limiter = None
+        self.current_video = None
+        self.closed = False
+
+    def run(self, video_path, **kwargs):
+        self.current_video = video_path
+        # Wait until both uploads are inside run() at the same time
+        self.started.wait()
+        return (id(self), self.current_video)
+
+    def close(self):
+        self.closed = True
+
+
+class ConcurrentUploadsTest(unittest.TestCase):
+
+    def test_two_jobs_on_one_platform_use_separate_instances(self):
+        FakePlatformPipeline.started = threading.Barrier(2, timeout=5)
+        with UploadPipeline(max_workers=2) as uploader:
+            uploader._register_platform('Fake', FakePlatformPipeline())
+            # Skip the ramp-up so both uploads are allowed in flight at once
+            uploader._platform_limiters['Fake'].limit = 2
+
+            first = uploader.submit('first.mp4', 'First')['Fake']
+            second = uploader.submit('second.mp4', 'Second')['Fake']
+            results = [first.result(timeout=10), second.result(timeout=10)]
+
+        self.assertTrue(all(result['success'] for result in results),
+                        results)
+        (first_id, first_video), (second_id, second_video) = [
+            result['result'] for result in results
+        ]
+        self.assertNotEqual(first_id, second_id)
+        self.assertEqual((first_video, second_video),
+                         ('first.mp4', 'second.mp4'))
+
+        pipelines = uploader._platform_pipelines['Fake']
+        self.assertEqual(len(pipelines), 2)
+        self.assertTrue(all(pipeline.closed for pipeline in pipelines))
+
+
+class FakeTokenResponse:
+    ok = True
+
+    def __init__(self, payload):
+        self.payload = payload
+
+    def json(self):
+        return self.payload
+
+
+class FakeTokenSession:
+    """Token endpoint that rotates the refresh token on every call."""
+
+    def __init__(self):
+        self.refresh_tokens_used = []
+
+    def post(self, url, data=None, **kwargs):
+        self.refresh_tokens_used.append(data['refresh_token'])
+        # Stay in flight long enough for the other instance to arrive
+        time.sleep(0.2)
+        count = len(self.refresh_tokens_used)
+        return FakeTokenResponse({
+            'access_token': f"access-{count}",
+            'expires_in': 86400,
+            'refresh_token': f"refresh-{count}"
+        })
+
+
+class SharedTokenStateTest(unittest.TestCase):
+
+    def test_pooled_instances_refresh_a_rotating_token_once(self):
+        session = FakeTokenSession()
+
+        def make_pipeline():
+            return TikTokUploadPipeline(tiktok_client_key='shared-client',
+                                        tiktok_client_secret='secret',
+                                        tiktok_refresh_token='refresh-0',
+                                        token_cache_path=None,
+                                        session=session)
+
+        pipelines = [make_pipeline(), make_pipeline()]
+        tokens = [None, None]
+
+        def authenticate(index):
+            tokens[index] = pipelines[index]._authenticate()
+
+        threads = [
+            threading.Thread(target=authenticate, args=(index, ))
+            for index in range(2)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=10)
+
+        self.assertEqual(session.refresh_tokens_used, ['refresh-0'])
+        self.assertEqual(tokens, ['access-1', 'access-1'])
+        # A pipeline created later keeps the rotated token
+        self.assertEqual(make_pipeline().refresh_token, 'refresh-1')
+
+
+if __name__ == '__main__':
+    unittest.main()